@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+author_detail.py - the per-author detail behind the dashboard's author page, shared by
+make_author_shards.py, make_pages.py, make_sqlite.py and serve_sigmetrics.py.
+
+build() returns {author id: detail}, where a detail holds
+  - papers:    [[record index, position, team size]], most recent first (the dashboard
+               already has the records, so titles/links are looked up there);
+  - coauthors: {coauthor id: {year: joint papers}}, so top collaborators for any year
+               window are a sum instead of a scan over all records;
+  - links:     dblp / homepage / Google Scholar, resolved from author_links.json;
+  - honors:    awards, chairs, officer terms and PC years, matched exactly like index.html
+               (exact normalized name first, then an unambiguous surname + initial match).
+
+Overlay files that are missing are simply skipped.
+"""
+import os
+import re
+
+from dataset import read_optional, load_papers
+from normalize import clean_name, norm_name, first_last, fuzzy_key, first_compatible
+
+_YEAR = re.compile(r"(\d{4})")
+
+
+def fnv1a(s):
+    h = 0x811C9DC5
+    for b in s.encode("utf-8"):
+        h = ((h ^ b) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+class HonorIndex:
+    """normalized name -> entries, plus the surname+initial buckets used as a fallback
+    (index.html nameAward / buildFuzzyFrom and friends)."""
+
+    def __init__(self):
+        self.exact = {}
+
+    def add(self, name, entry):
+        k = norm_name(name)
+        if k:
+            self.exact.setdefault(k, []).append(entry)
+
+    def finish(self):
+        self.fuzzy = {}
+        for nn, entries in self.exact.items():
+            self.fuzzy.setdefault(fuzzy_key(nn), []).append(
+                {"first": first_last(nn)[0], "name": nn, "entries": entries})
+        return self
+
+
+def load_honors(data_dir):
+    aw, ch, of, pc = HonorIndex(), HonorIndex(), HonorIndex(), HonorIndex()
+    raw = read_optional(os.path.join(data_dir, "awards.json")) or {}
+    for a in raw.get("achievement") or []:
+        aw.add(a.get("name"), {"type": "achievement", "year": a.get("year")})
+    for a in raw.get("risingStar") or []:
+        aw.add(a.get("name"), {"type": "rising", "year": a.get("year")})
+    for a in raw.get("doctoral") or []:
+        if a.get("kind") == "winner":
+            aw.add(a.get("name"), {"type": "doctoral", "year": a.get("year")})
+    raw = read_optional(os.path.join(data_dir, "chairs.json")) or {}
+    for c in raw.get("conferences") or []:
+        for n in c.get("general") or []:
+            ch.add(n, {"role": "general", "year": c.get("year")})
+        for n in c.get("program") or []:
+            ch.add(n, {"role": "program", "year": c.get("year")})
+    raw = read_optional(os.path.join(data_dir, "officers.json")) or {}
+    for t in raw.get("terms") or []:
+        for r in t.get("roles") or []:
+            for n in r.get("people") or []:
+                of.add(n, {"term": t.get("term"), "role": r.get("role"), "current": bool(t.get("current"))})
+    raw = read_optional(os.path.join(data_dir, "pc.json")) or {}
+    for rec in raw.get("years") or []:
+        for n in rec.get("members") or []:
+            pc.add(n, {"year": rec.get("year")})
+    return aw.finish(), ch.finish(), of.finish(), pc.finish()
+
+
+def dataset_fuzzy(meta):
+    """fuzzy key -> [(id, first)] over every name in authorMeta (index.html fuzzyAuthors)."""
+    out = {}
+    for aid, m in meta.items():
+        for nm in [m.get("canonicalName"), m.get("name"), *(m.get("aliases") or [])]:
+            k = norm_name(nm)
+            if not k:
+                continue
+            c = (aid, first_last(k)[0])
+            lst = out.setdefault(fuzzy_key(k), [])
+            if c not in lst:
+                lst.append(c)
+    return out
+
+
+def honors_for(aid, names, idx, ds_fuzzy, key):
+    seen, out = set(), []
+
+    def add(e):
+        k = key(e)
+        if k not in seen:
+            seen.add(k)
+            out.append(e)
+
+    for nm in names:
+        for e in idx.exact.get(norm_name(nm), ()):
+            add(e)
+    if not out:
+        for nm in names:
+            nn = norm_name(nm)
+            fk, af = fuzzy_key(nn), first_last(nn)[0]
+            ids = list(dict.fromkeys(i for i, f in ds_fuzzy.get(fk, ()) if first_compatible(af, f)))
+            if len(ids) != 1 or ids[0] != aid:
+                continue                                   # this author must be the sole holder
+            buckets = [b for b in idx.fuzzy.get(fk, ()) if first_compatible(af, b["first"])]
+            if len({b["name"] for b in buckets}) != 1:
+                continue                                   # one honored person only
+            for b in buckets:
+                for e in b["entries"]:
+                    add(e)
+    return out
+
+
+def _term_year(e):
+    if e["current"]:
+        return 9999
+    m = _YEAR.search(e.get("term") or "")
+    return int(m.group(1)) if m else 0
+
+
+def build(raw, data_dir="data"):
+    meta = raw.get("authorMeta") or {}
+    links = read_optional(os.path.join(data_dir, "author_links.json")) or {}
+    by_pid, by_name = links.get("byPid") or {}, links.get("byName") or {}
+    aw, ch, of, pc = load_honors(data_dir)
+    ds_fuzzy = dataset_fuzzy(meta)
+
+    first_name, pid, papers, coauthors = {}, {}, {}, {}
+    for p in load_papers(raw):
+        rec = raw["records"][p["index"]]
+        pids = [a.get("pid") if isinstance(a, dict) else None for a in rec.get("authors") or []]
+        ids, size, y = p["ids"], len(p["ids"]), p["year"]
+        for i, aid in enumerate(ids):
+            first_name.setdefault(aid, p["names"][i])
+            if not pid.get(aid) and i < len(pids) and pids[i]:
+                pid[aid] = pids[i]
+            pos = "solo" if size == 1 else "first" if i == 0 else "last" if i == size - 1 else "middle"
+            papers.setdefault(aid, []).append([p["index"], pos, size])
+            co = coauthors.setdefault(aid, {})
+            for j, other in enumerate(ids):
+                if j != i:
+                    by_year = co.setdefault(other, {})
+                    by_year[y] = by_year.get(y, 0) + 1
+
+    years = {p[0]: int(raw["records"][p[0]]["year"]) for lst in papers.values() for p in lst}
+    detail = {}
+    for aid, lst in papers.items():
+        m = meta.get(aid) or {}
+        name = clean_name(m.get("canonicalName") or m.get("name") or first_name[aid])
+        names = [name, *(m.get("aliases") or [m.get("canonicalName") or m.get("name") or first_name[aid]])]
+        real_pid = pid.get(aid) or m.get("pid")
+        L = by_pid.get(real_pid) or by_name.get(name) or {}
+        link = {k: L[k] for k in ("homepage", "googleScholar") if L.get(k)}
+        dblp = L.get("dblp") or (f"https://dblp.org/pid/{real_pid}.html" if real_pid else None)
+        if dblp:
+            link["dblp"] = dblp
+        awards = sorted(honors_for(aid, names, aw, ds_fuzzy, lambda e: f"{e['type']}{e['year']}"),
+                        key=lambda e: -(e["year"] or 0))
+        chairs = sorted(honors_for(aid, names, ch, ds_fuzzy, lambda e: f"{e['role']}{e['year']}"),
+                        key=lambda e: -(e["year"] or 0))
+        officers = sorted(honors_for(aid, names, of, ds_fuzzy, lambda e: f"{e['term']}{e['role']}"),
+                          key=lambda e: -_term_year(e))
+        pc_years = sorted({e["year"] for e in honors_for(aid, names, pc, ds_fuzzy, lambda e: str(e["year"]))})
+        d = {"papers": sorted(lst, key=lambda p: -years[p[0]]),
+             "coauthors": {c: {str(y): n for y, n in sorted(ys.items())} for c, ys in coauthors[aid].items()},
+             "links": link}
+        honors = {k: v for k, v in (("awards", awards), ("chairs", chairs),
+                                    ("officers", officers), ("pc", pc_years)) if v}
+        if honors:
+            d["honors"] = honors
+        detail[aid] = d
+    return detail
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+build.py - produce every derived file under data/ with make-style dependency tracking.
+
+Two kinds of stage:
+  - overlay generators (awards, chairs, officers, pc, submissions): the transcribed-data
+    scripts, run as-is in a scratch directory; their output replaces data/<name>.json only
+    when it differs in something other than `generatedAt`, so unchanged overlays keep their
+    bytes (and HTTP caches stay valid);
+  - dataset builders (snapshot, delta, ndjson, cube, growth, graph, search, csr, columnar, shards,
+    pages, bootstrap, merges, titles, sqlite and, with --links, the CSRankings links): they
+    share ONE parse of data/sigmetrics.json, which is read only if one of them has to run
+    (from data/sigmetrics.snap when that is still current).
+
+A stage is skipped when none of its inputs changed since its last successful run: the
+dataset (for builders), the data files it reads, its own script and every local module it
+imports, the shared HELPERS, and its raw sources (pc_raw/*.txt, csconferences.csv). Per-file digests live in
+data/.build_state.json, so the run reports which input caused each rebuild. A stage whose
+required raw source is missing is skipped rather than run with partial input.
+
+Stages whose dependencies are done run in parallel worker processes (builders share the
+parsed dataset through fork(); without fork they run one after another). `shards` waits
+for the overlays and links it reads. Add an artifact by appending a Stage to STAGES.
+
+  python3 build.py                     # rebuild what changed
+  python3 build.py --force             # rebuild everything
+  python3 build.py --only search,cube  # just these stages
+  python3 build.py --links             # also refresh author_links.json (fetches CSRankings)
+"""
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from dataset import DEFAULT_DATA, read_json, write_json
+from snapshot import load_dataset
+
+STATE_FILE = ".build_state.json"
+HELPERS = ("dataset.py", "normalize.py", "snapshot.py", "unionfind.py")
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Stage:
+    """One derived file. `run(raw, data_dir)` writes it and returns a one-line summary.
+
+    output    path of the artifact, relative to the data directory
+    sources   files/globs relative to this directory whose content decides the output
+    inputs    data files (relative to the data directory) read besides the dataset
+    requires  sources that must exist, or the stage is skipped
+    after     stages that must finish first
+    uses_data whether the stage reads sigmetrics.json
+    """
+
+    def __init__(self, name, output, run, sources, inputs=(), requires=(), after=(),
+                 uses_data=True, optional=False):
+        self.name, self.output, self.run = name, output, run
+        self.sources, self.inputs, self.requires = tuple(sources), tuple(inputs), tuple(requires)
+        self.after, self.uses_data, self.optional = tuple(after), uses_data, optional
+
+    def missing(self):
+        return [r for r in self.requires if not glob.glob(os.path.join(HERE, r))]
+
+    def digests(self, data_digest, data_dir):
+        """{input: sha256} for everything this stage depends on."""
+        d = {"<dataset>": data_digest} if self.uses_data else {}
+        for f in self.inputs:
+            d["data/" + f] = _file_digest(os.path.join(data_dir, f))
+        for pattern in self.sources + (HELPERS if self.uses_data else ()):
+            paths = sorted(glob.glob(os.path.join(HERE, pattern))) or [os.path.join(HERE, pattern)]
+            for p in paths:
+                d[os.path.relpath(p, HERE)] = _file_digest(p)
+        return d
+
+
+def _file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return "-"
+
+
+def _unstamped(obj):
+    if isinstance(obj, dict):
+        obj = {k: v for k, v in obj.items() if k != "generatedAt"}
+    return obj
+
+
+def _without_stamp(path):
+    try:
+        return _unstamped(read_json(path))
+    except (OSError, ValueError):
+        return None
+
+
+def _overlay(script, out_name, links=()):
+    """Run a transcribed-data generator in a scratch dir (it writes data/<out_name> relative
+    to its cwd) and install the result only if its content changed."""
+    def run(raw, data_dir):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in links:                              # raw sources the script reads
+                src = os.path.join(HERE, name)
+                if os.path.exists(src):
+                    os.symlink(src, os.path.join(tmp, name))
+            os.makedirs(os.path.join(tmp, "data"))
+            subprocess.run([sys.executable, os.path.join(HERE, script)], cwd=tmp, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            new, dest = os.path.join(tmp, "data", out_name), os.path.join(data_dir, out_name)
+            if _without_stamp(new) == _without_stamp(dest):
+                return "content unchanged, file kept"
+            shutil.copyfile(new, dest + ".tmp")
+            os.replace(dest + ".tmp", dest)
+            return "written"
+    return run
+
+
+def _json_stage(module, out_name, describe):
+    def run(raw, data_dir):
+        mod = __import__(module)
+        out, path = mod.build(raw), os.path.join(data_dir, out_name)
+        if _without_stamp(path) == json.loads(json.dumps(_unstamped(out))):
+            return describe(out) + ", content unchanged, file kept"
+        write_json(path, out)
+        return describe(out)
+    return run
+
+
+def _run_shards(raw, data_dir):
+    import make_author_shards as m
+    detail = m.build(raw, data_dir)
+    n, written = m.write_shards(detail, os.path.join(data_dir, "authors"), m.DEFAULT_BUCKETS, raw.get("fetchedAt") or 0)
+    return f"{n} shards for {len(detail)} authors, {written} files changed"
+
+
+def _run_sqlite(raw, data_dir):
+    import make_sqlite as m
+    counts = m.build(raw, data_dir, os.path.join(data_dir, "sigmetrics.sqlite"))
+    return f"{counts['records']} records, {counts['authorships']} authorships, {counts['honors']} honors"
+
+
+def _run_snapshot(raw, data_dir):
+    import snapshot
+    path = snapshot.write(raw, os.path.join(data_dir, "sigmetrics.json"))
+    return f"{os.path.getsize(path)} bytes"
+
+
+def _run_csr(raw, data_dir):
+    import make_coauthor_csr as m
+    if m.np is None:
+        return "NumPy not installed, not written"
+    graph = m.build(raw)
+    m.write(graph, os.path.join(data_dir, "coauthor_csr"), raw.get("fetchedAt") or 0)
+    return f"{graph['nodes']} authors, {graph['edges']} coauthor pairs"
+
+
+def _run_columnar(raw, data_dir):
+    import make_columnar as m
+    if m.engine() is None:
+        return "neither pyarrow nor NumPy installed, not written"
+    schema = m.write(raw, os.path.join(data_dir, "columnar"))
+    return f"{schema['layout']} via {schema['engine']}"
+
+
+def _run_delta(raw, data_dir):
+    import make_delta as m
+    if raw.get("sample"):
+        m.publish_next(raw, data_dir)
+        return "sample data, manifest removed"
+    path = m.publish_next(raw, data_dir)
+    return f"{os.path.basename(path)}, {os.path.getsize(path)} bytes" if path else "manifest only"
+
+
+def _run_ndjson(raw, data_dir):
+    import make_ndjson as m
+    path = m.write(raw, os.path.join(data_dir, "sigmetrics.ndjson"))
+    return f"{os.path.getsize(path)} bytes"
+
+
+def _run_pages(raw, data_dir):
+    import make_pages as m
+    n = m.build(raw, data_dir, os.path.join(data_dir, os.pardir, m.DEFAULT_OUT))
+    return f"{n['rendered']} of {n['authors']} author pages rendered, {n['removed']} removed"
+
+
+def _run_bootstrap(raw, data_dir):
+    import make_bootstrap as m
+    site = os.path.join(data_dir, os.pardir)
+    boot = m.write(raw, os.path.join(data_dir, "sigmetrics.json"), os.path.join(site, m.DEFAULT_HTML),
+                   os.path.join(site, m.DEFAULT_OUT))
+    return f"{boot['startYear']}–{boot['endYear']} Overview inline, version {boot['version']}"
+
+
+def _run_merges(raw, data_dir):
+    import make_author_merges as m
+    out = m.build(raw)
+    write_json(os.path.join(data_dir, "author_merges.json"), out, indent=1)
+    return f"{out['stats']['merged']} ids merged into {len(out['clusters'])} authors"
+
+
+def _run_titles(raw, data_dir):
+    import make_title_matches as m
+    try:
+        awards = read_json(os.path.join(data_dir, "awards.json"))
+    except (OSError, ValueError):
+        awards = None
+    out = m.build(raw, awards)
+    write_json(os.path.join(data_dir, "title_matches.json"), out, indent=1)
+    s = out["stats"]
+    return f"{s['fuzzy']} award titles matched by similarity, {s['duplicates']} likely duplicates"
+
+
+def _run_links(raw, data_dir):
+    import make_author_links_from_csrankings as m
+    out = m.build_links(raw, m.load_csrankings_map())
+    write_json(os.path.join(data_dir, "author_links.json"), out, indent=2)
+    return f"{len(out['byPid'])} by pid, {len(out['byName'])} by name"
+
+
+OVERLAYS = ["awards", "chairs", "officers", "pc"]
+
+STAGES = [
+    Stage("awards", "awards.json", _overlay("make_awards.py", "awards.json"), ["make_awards.py"], uses_data=False),
+    Stage("chairs", "chairs.json", _overlay("make_chairs.py", "chairs.json"), ["make_chairs.py"], uses_data=False),
+    Stage("officers", "officers.json", _overlay("make_officers.py", "officers.json"), ["make_officers.py"],
+          uses_data=False),
+    Stage("pc", "pc.json", _overlay("make_pc.py", "pc.json", ["pc_raw"]),
+          ["make_pc.py", "normalize.py", "pc_raw/*.txt"], requires=["pc_raw/*.txt"], uses_data=False),
+    Stage("submissions", "submissions.json", _overlay("make_submissions.py", "submissions.json", ["csconferences.csv"]),
+          ["make_submissions.py", "csconferences.csv"], requires=["csconferences.csv"], uses_data=False),
+    Stage("snapshot", "sigmetrics.snap", _run_snapshot, ["snapshot.py"]),
+    Stage("delta", "manifest.json", _run_delta, ["make_delta.py", "author_stats.py"]),
+    Stage("ndjson", "sigmetrics.ndjson", _run_ndjson, ["make_ndjson.py"]),
+    Stage("links", "author_links.json", _run_links, ["make_author_links_from_csrankings.py"], optional=True),
+    Stage("cube", "window_cube.json",
+          _json_stage("make_window_cube", "window_cube.json", lambda o: f"{len(o['rows'])} windows"),
+          ["make_window_cube.py"]),
+    Stage("growth", "network_growth.json",
+          _json_stage("make_network_growth", "network_growth.json", lambda o: f"{len(o['years'])} years"),
+          ["make_network_growth.py"]),
+    Stage("graph", "graph_metrics.json",
+          _json_stage("graph_analytics", "graph_metrics.json", lambda o: f"{len(o['windows'])} windows via {o['engine']}"),
+          ["graph_analytics.py"]),
+    Stage("search", "search_index.json",
+          _json_stage("make_search_index", "search_index.json", lambda o: f"{len(o['authors'])} authors indexed"),
+          ["make_search_index.py"]),
+    Stage("csr", os.path.join("coauthor_csr", "graph.json"), _run_csr, ["make_coauthor_csr.py"]),
+    Stage("columnar", os.path.join("columnar", "schema.json"), _run_columnar, ["make_columnar.py"]),
+    Stage("shards", os.path.join("authors", "index.json"), _run_shards, ["make_author_shards.py", "author_detail.py"],
+          inputs=["author_links.json"] + [f"{o}.json" for o in OVERLAYS],
+          after=["links"] + OVERLAYS),
+    Stage("pages", os.path.join(os.pardir, "pages", "pages.json"), _run_pages, ["make_pages.py", "author_detail.py"],
+          inputs=["author_links.json"] + [f"{o}.json" for o in OVERLAYS],
+          after=["links"] + OVERLAYS),
+    Stage("bootstrap", os.path.join(os.pardir, "index.boot.html"), _run_bootstrap,
+          ["make_bootstrap.py", "window_index.py", "author_detail.py", "index.html"],
+          inputs=["submissions.json"], after=["submissions"]),
+    Stage("merges", "author_merges.json", _run_merges, ["make_author_merges.py", "normalize.py", "unionfind.py"]),
+    Stage("titles", "title_matches.json", _run_titles, ["make_title_matches.py", "normalize.py"],
+          inputs=["awards.json"], after=["awards"]),
+    Stage("sqlite", "sigmetrics.sqlite", _run_sqlite, ["make_sqlite.py", "author_detail.py"],
+          inputs=["author_links.json", "submissions.json", "title_matches.json"] + [f"{o}.json" for o in OVERLAYS],
+          after=["links", "submissions", "titles"] + OVERLAYS),
+]
+
+_RAW = None          # the parsed dataset, inherited by forked workers
+
+
+def _work(name, data_dir):
+    stage = next(s for s in STAGES if s.name == name)
+    t0 = time.time()
+    return stage.run(_RAW, data_dir), time.time() - t0
+
+
+def _reason(old, new, force):
+    if force:
+        return "forced"
+    if not old:
+        return "no previous build"
+    changed = [k for k in new if old.get(k) != new[k]]
+    if not changed:
+        return "output missing"
+    return "changed: " + ", ".join(changed[:4]) + (f" (+{len(changed) - 4} more)" if len(changed) > 4 else "")
+
+
+def run(raw, data_path=DEFAULT_DATA, only=None, force=False, links=False, jobs=None, log=print):
+    """Run the selected stages that are out of date. `raw` is the parsed dataset, or a
+    callable returning it (called only if a dataset stage has to run). Returns
+    {stage: status}."""
+    global _RAW
+    data_dir = os.path.dirname(data_path) or "."
+    state_path = os.path.join(data_dir, STATE_FILE)
+    try:
+        state = read_json(state_path)
+    except (OSError, ValueError):
+        state = {}
+    data_digest = _file_digest(data_path)
+
+    selected = [s for s in STAGES if (only is None or s.name in only) and (links or not s.optional or only)]
+    names = {s.name for s in selected}
+    pending, status = {s.name: s for s in selected}, {}
+
+    pool, pool_has_raw = None, False
+    try:
+        while pending:
+            # digests are taken once a stage's dependencies are done, so a stage that reads
+            # another stage's output sees the new bytes
+            ready = [s for s in pending.values() if not any(a in pending for a in s.after if a in names)]
+            todo = {}
+            for s in ready:
+                del pending[s.name]
+                miss = s.missing()
+                if miss:
+                    status[s.name] = "skipped"
+                    log(f"  {s.name:<11} skipped: missing {', '.join(miss)}")
+                    continue
+                d = s.digests(data_digest, data_dir)
+                old = (state.get(s.name) or {}).get("inputs")
+                if not force and old == d and os.path.exists(os.path.join(data_dir, s.output)):
+                    status[s.name] = "up to date"
+                    log(f"  {s.name:<11} up to date")
+                    continue
+                todo[s.name] = (d, _reason(old, d, force))
+            if any(next(s for s in STAGES if s.name == n).uses_data for n in todo) and _RAW is None:
+                _RAW = raw() if callable(raw) else raw
+            if pool and not pool_has_raw and _RAW is not None:
+                pool.shutdown()                     # forked before the dataset was read: workers lack it
+                pool = None
+            if pool is None and len(todo) > 1 and jobs != 1 and "fork" in multiprocessing.get_all_start_methods():
+                pool = ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1,
+                                           mp_context=multiprocessing.get_context("fork"))
+                pool_has_raw = _RAW is not None
+            futures = {n: pool.submit(_work, n, data_dir) for n in todo} if pool and len(todo) > 1 else {}
+            for n, (d, why) in todo.items():
+                try:
+                    summary, secs = futures[n].result() if n in futures else _work(n, data_dir)
+                except subprocess.CalledProcessError as e:
+                    status[n] = "FAILED"
+                    log(f"  {n:<11} FAILED ({why}): {(e.stderr or '').strip().splitlines()[-1:] or e}")
+                    continue
+                except Exception as e:              # one failing stage must not stop the others
+                    status[n] = "FAILED"
+                    log(f"  {n:<11} FAILED ({why}): {e}")
+                    continue
+                state[n] = {"inputs": d, "builtAt": int(time.time() * 1000)}
+                status[n] = "rebuilt"
+                log(f"  {n:<11} rebuilt ({why}): {summary} [{secs:.1f}s]")
+    finally:
+        _RAW = None
+        if pool:
+            pool.shutdown()
+    write_json(state_path, state, indent=1)
+    return status
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Rebuild the derived data files whose inputs changed")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--only", help="Comma-separated stages: " + ",".join(s.name for s in STAGES))
+    ap.add_argument("--force", action="store_true", help="Rebuild even when inputs are unchanged")
+    ap.add_argument("--links", action="store_true", help="Also rebuild author_links.json (fetches CSRankings)")
+    ap.add_argument("--jobs", type=int, help="Worker processes (default: CPU count; 1 = serial)")
+    args = ap.parse_args()
+
+    only = set(args.only.split(",")) if args.only else None
+    unknown = (only or set()) - {s.name for s in STAGES}
+    if unknown:
+        ap.error("unknown stage(s): " + ", ".join(sorted(unknown)))
+    t0 = time.time()
+
+    def load():
+        t = time.time()
+        raw = load_dataset(args.data)
+        print(f"  (read {args.data}: {len(raw.get('records') or [])} records in {time.time() - t:.1f}s)")
+        return raw
+
+    status = run(load, args.data, only, args.force, args.links, args.jobs)
+    counts = {k: sum(st == k for st in status.values()) for k in ("rebuilt", "up to date", "skipped", "FAILED")}
+    print(f"Done in {time.time() - t0:.1f}s: {counts['rebuilt']} rebuilt, {counts['up to date']} up to date, "
+          f"{counts['skipped']} skipped, {counts['FAILED']} failed")
+    if counts["FAILED"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+dataset.py - read data/sigmetrics.json the way index.html does, for the offline builders.
+
+The dashboard cleans author names (drops dblp's " 0001" suffix), merges identity by author
+`id`, and leaves editorships / author-less records out of every metric. The helpers here
+apply the same rules so precomputed numbers match what the browser would compute.
+"""
+import json
+import os
+
+from normalize import clean_name
+
+DEFAULT_DATA = os.path.join("data", "sigmetrics.json")
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_optional(path):
+    """The parsed file, or None when it is missing or not valid JSON (optional overlays)."""
+    try:
+        return read_json(path)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, obj, indent=None):
+    """Write JSON atomically (tmp file + rename), compact unless indent is given."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        if indent is None:
+            json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(obj, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp, path)
+
+
+def surname(n):
+    p = clean_name(n).strip().split()
+    return (p[-1] if p else "").lower()
+
+
+def is_alphabetical(names):
+    """Author list ordered by surname (index.html isAlphabetical)."""
+    if len(names) < 2:
+        return False
+    return all(surname(names[i]) >= surname(names[i - 1]) for i in range(1, len(names)))
+
+
+def record_authors(r):
+    """[(id, cleaned name, pid)] for one record, as parseRaw builds them."""
+    out = []
+    for a in r.get("authors") or []:
+        if isinstance(a, str):
+            aid, name, pid = "name:" + a, clean_name(a), None
+        else:
+            aid = a.get("id") or (("pid:" + a["pid"]) if a.get("pid") else "name:" + (a.get("name") or ""))
+            name, pid = clean_name(a.get("name") or aid), a.get("pid") or None
+        if name:
+            out.append((aid, name, pid))
+    return out
+
+
+def load_papers(raw):
+    """The records every dashboard metric counts: a year, at least one author, not an
+    editorship. Returns [{index, year, key, title, ids, names}] in dataset order, where
+    `index` is the position in raw["records"]."""
+    papers = []
+    for i, r in enumerate(raw.get("records") or []):
+        if r.get("year") is None or "editor" in (r.get("type") or "").lower():
+            continue
+        au = record_authors(r)
+        if not au:
+            continue
+        title = r.get("title") or ""
+        papers.append({"index": i, "year": int(r["year"]), "key": r.get("key") or "",
+                       "title": title[:-1] if title.endswith(".") else title,
+                       "ids": [a[0] for a in au], "names": [a[1] for a in au]})
+    return papers
+
+
+def author_postings(records):
+    """author id -> ascending indices of the records they are on. Records are sorted by
+    (year, key), so each list is also in year order and a year window is a binary search."""
+    postings = {}
+    for i, r in enumerate(records):
+        for aid in dict.fromkeys(r["authorIds"]):
+            postings.setdefault(aid, []).append(i)
+    return postings
+
+
+def year_offsets(records, start_year, end_year):
+    """{year: index of its first record} for start_year..end_year+1 over year-sorted records;
+    the records of years [a, b] are records[off[a]:off[b + 1]]."""
+    off, i = {}, 0
+    for y in range(start_year, end_year + 2):
+        while i < len(records) and records[i]["year"] < y:
+            i += 1
+        off[str(y)] = i
+    return off
+
+
+def year_span(raw):
+    """(fullMin, fullMax) exactly as parseRaw picks the selectable range."""
+    ys = [int(r["year"]) for r in raw.get("records") or [] if r.get("year") is not None]
+    lo = raw.get("startYear") or (min(ys) if ys else 1974)
+    hi = raw.get("endYear") or (max(ys) if ys else 2026)
+    return lo, hi
+
+
+def gini(values):
+    """Gini coefficient of the positive values (index.html gini().g)."""
+    x = sorted(v for v in values if v > 0)
+    n = len(x)
+    if not n:
+        return 0.0
+    tot = sum(x)
+    s = sum((i + 1) * v for i, v in enumerate(x))
+    return (2 * s) / (n * tot) - (n + 1) / n
@@ -25,15 +25,22 @@ WHY THIS VERSION:
 """
 
 import argparse
+import contextlib
 import json
 import os
 import random
 import time
 import urllib.parse
 import urllib.request
-from collections import defaultdict, Counter
+from collections import Counter
 from urllib.error import HTTPError, URLError
 
+import build
+import make_ndjson
+from author_stats import AuthorState, author_columns
+from dataset import author_postings, year_offsets
+from normalize import name_keys, norm_title
+
 API = "https://dblp.org/search/publ/api"
 STREAM = "stream:streams/conf/sigmetrics:"   # the official SIGMETRICS stream feed
 PAGE_SIZE = 1000                              # dblp max hits per request
@@ -110,7 +117,9 @@ def normalize_authors(auth_node):
 def choose_canonical_name(alias_counts):
     if not alias_counts:
         return None
-    items = sorted(alias_counts.items(), key=lambda kv: (-kv[1], len(kv[0])))
+    # most used, then shortest, then lexical: independent of the order names were seen,
+    # so an incremental rebuild (AuthorState) picks the same name as a full one
+    items = sorted(alias_counts.items(), key=lambda kv: (-kv[1], len(kv[0]), kv[0]))
     return items[0][0]
 
 
@@ -234,8 +243,25 @@ def fetch_toc(start, end, timeout, retries, delay):
 
 
 # ------------------------------------------------------------------------- assembly
+def make_author_meta(aid, pid, alias_counts):
+    canonical = choose_canonical_name(alias_counts) or aid
+    aliases = sorted(alias_counts.keys(), key=str.lower)
+    norm_names, fuzzy_keys = name_keys([canonical] + aliases)
+    return {"id": aid, "pid": pid, "name": canonical, "canonicalName": canonical,
+            "aliases": aliases, "normNames": norm_names, "fuzzyKeys": fuzzy_keys}
+
+
 def build_dataset(hits, start_year, end_year, keep_nonconf,
-                  page_filter_end_year, min_pages_pre):
+                  page_filter_end_year, min_pages_pre, use_numpy=None, state=None, sink=None):
+    """Filter hits into records and aggregate authorMeta / authors from them.
+
+    `sink` (a make_ndjson.Writer) is handed each record in year order as soon as they are
+    sorted, then the authorMeta entries, the author rows and the notes, one at a time.
+
+    With `state` (an AuthorState loaded from the previous run's sidecar) the aggregates
+    are updated from the record delta instead of recomputed; notes["delta"] then lists the
+    added/removed/changed record counts and the ids of every author whose meta or stats
+    may differ, so caches and shards keyed by author can be refreshed selectively."""
     records = []
     author_meta_agg = {}
     seen_keys = set()
@@ -277,7 +303,7 @@ def build_dataset(hits, start_year, end_year, keep_nonconf,
             seen_keys.add(key)
 
         authors = normalize_authors(info.get("authors") or {})
-        for a in authors:
+        for a in authors if state is None else ():
             aid = a["id"]
             m = author_meta_agg.setdefault(aid, {"pid": a.get("pid"), "alias_counts": Counter()})
             if (not m["pid"]) and a.get("pid"):
@@ -287,58 +313,59 @@ def build_dataset(hits, start_year, end_year, keep_nonconf,
                 m["alias_counts"][nm] += 1
 
         records.append({
-            "year": y, "title": title,
+            "year": y, "title": title, "normTitle": norm_title(title),
             "authors": authors, "authorIds": [a["id"] for a in authors],
             "venue": info.get("venue") or "", "pages": pages,
             "doi": info.get("doi") or "", "url": info.get("ee") or info.get("url") or "",
             "key": key, "type": info_type,
         })
 
+    hit_order = dict.fromkeys(aid for r in records for aid in r["authorIds"])  # authorMeta order
     records.sort(key=lambda r: (r["year"], r["key"]))
-
-    author_meta = {}
-    for aid, m in author_meta_agg.items():
-        canonical = choose_canonical_name(m["alias_counts"]) or aid
-        author_meta[aid] = {"id": aid, "pid": m["pid"], "name": canonical,
-                            "canonicalName": canonical,
-                            "aliases": sorted(m["alias_counts"].keys(), key=str.lower)}
-
-    stats = {}
-    def gs(aid):
-        return stats.setdefault(aid, {"pubs": 0, "firstAuth": 0, "lastAuth": 0, "solo": 0,
-                                      "years": defaultdict(int), "coauthors": set(), "teamSizes": []})
-    for r in records:
-        team = len(r["authorIds"])
-        for i, aid in enumerate(r["authorIds"]):
-            s = gs(aid)
-            s["pubs"] += 1
-            s["years"][r["year"]] += 1
-            s["teamSizes"].append(team)
-            if team == 1: s["solo"] += 1
-            if i == 0: s["firstAuth"] += 1
-            if i == team - 1: s["lastAuth"] += 1
-            for j, bid in enumerate(r["authorIds"]):
-                if j != i: s["coauthors"].add(bid)
-
-    authors = []
-    for aid, s in stats.items():
-        ya = sorted(s["years"].keys())
-        meta = author_meta.get(aid, {})
-        authors.append({
-            "id": aid, "pid": meta.get("pid"),
-            "name": meta.get("canonicalName") or aid, "aliases": meta.get("aliases") or [],
-            "pubs": s["pubs"], "firstAuth": s["firstAuth"], "lastAuth": s["lastAuth"],
-            "solo": s["solo"], "coauthors": len(s["coauthors"]),
-            "avgTeam": (sum(s["teamSizes"]) / len(s["teamSizes"])) if s["teamSizes"] else 0.0,
-            "activeYears": len(ya), "firstYear": ya[0] if ya else None,
-            "lastYear": ya[-1] if ya else None,
-        })
+    if sink is not None:
+        sink.begin(len(records))
+        for r in records:
+            sink.record(r)
+
+    delta = None
+    if state is None:
+        author_meta = {aid: make_author_meta(aid, m["pid"], m["alias_counts"])
+                       for aid, m in author_meta_agg.items()}
+        cols = author_columns(records, use_numpy)
+    else:
+        changed, delta = state.update(records)
+        for aid in changed:
+            m = state.authors.get(aid)
+            if m is not None:
+                m["meta"] = make_author_meta(aid, m["pid"], m["aliases"])
+        delta["authors"] = changed
+        author_meta = {aid: state.authors[aid]["meta"] for aid in hit_order}
+        cols = state.columns(records)
+
+    metas = [author_meta.get(aid, {}) for aid in cols["id"]]
+    authors = [{
+        "id": aid, "pid": meta.get("pid"),
+        "name": meta.get("canonicalName") or aid, "aliases": meta.get("aliases") or [],
+        "pubs": pubs, "firstAuth": fa, "lastAuth": la, "solo": solo, "coauthors": co,
+        "avgTeam": (ts / pubs) if pubs else 0.0,
+        "activeYears": ay, "firstYear": fy, "lastYear": ly,
+    } for aid, meta, pubs, fa, la, solo, co, ts, ay, fy, ly in zip(
+        cols["id"], metas, cols["pubs"], cols["firstAuth"], cols["lastAuth"], cols["solo"],
+        cols["coauthors"], cols["teamSum"], cols["activeYears"], cols["firstYear"], cols["lastYear"])]
 
     notes = {"maxHitsPerToc": PAGE_SIZE, "pageFilterEndYear": page_filter_end_year,
              "minPagesPre2017": min_pages_pre, "skippedNonConfOrEditorship": skipped_type,
              "skippedByPageLength": skipped_pages, "skippedOutOfYearRange": skipped_year,
              "duplicateKeysDropped": dupes}
-    return records, author_meta, authors, notes
+    if delta is not None:
+        notes["delta"] = delta
+    if sink is not None:
+        for aid, m in author_meta.items():
+            sink.meta(aid, m)
+        for a in authors:
+            sink.author(a)
+        sink.fields({"notes": notes})
+    return records, author_meta, authors, author_postings(records), notes
 
 
 def main():
@@ -358,7 +385,22 @@ def main():
                     help="Last year to apply page-length filtering (default 2016)")
     ap.add_argument("--keep-nonconf", action="store_true",
                     help="Keep non-conference-like entries too (still drops editorship)")
+    ap.add_argument("--build", action="store_true",
+                    help="Afterwards run build.py's stages (snapshot, delta, NDJSON, derived "
+                         "files) on the in-memory dataset (no re-read)")
+    ap.add_argument("--no-numpy", action="store_true",
+                    help="Aggregate author stats in pure Python even if NumPy is installed "
+                         "(full recomputes only; --state updates authors in Python)")
+    ap.add_argument("--state", nargs="?", const="", default=None, metavar="PATH",
+                    help="Keep an aggregate state sidecar and recompute only the authors of "
+                         "changed records (PATH default: <out without .json>.state.json)")
+    ap.add_argument("--format", choices=["json", "ndjson"], default="json",
+                    help="ndjson: also stream <out without .json>.ndjson (records in year "
+                         "order, line by line) while the dataset is assembled; the dashboard "
+                         "renders it progressively. An existing .ndjson is always rewritten "
+                         "(default json)")
     args = ap.parse_args()
+    state_path = None if args.state is None else (args.state or os.path.splitext(args.out)[0] + ".state.json")
 
     print(f"SIGMETRICS fetch: method={args.method}, years {args.start}..{args.end}, "
           f"delay={args.delay}s, retries={args.retries}")
@@ -382,20 +424,31 @@ def main():
               "feed changed. You can also try: python3 fetch_sigmetrics.py --method toc")
         raise SystemExit(1)
 
-    records, author_meta, authors, notes = build_dataset(
-        hits, args.start, args.end, args.keep_nonconf,
-        args.page_filter_end_year, args.min_pages_pre2017)
-
-    out = {"fetchedAt": int(time.time() * 1000), "startYear": args.start, "endYear": args.end,
-           "source": "dblp stream:streams/conf/sigmetrics" if args.method == "stream"
-                     else "dblp per-year TOC",
-           "records": records, "authorMeta": author_meta, "authors": authors, "notes": notes}
-
-    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
-    tmp = args.out + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False)
-    os.replace(tmp, args.out)  # atomic
+    head = {"fetchedAt": int(time.time() * 1000), "startYear": args.start, "endYear": args.end,
+            "source": "dblp stream:streams/conf/sigmetrics" if args.method == "stream"
+                      else "dblp per-year TOC"}
+    state = AuthorState.load(state_path) if state_path else None
+    ndjson = os.path.splitext(args.out)[0] + ".ndjson"
+    # the stream is written while the dataset is assembled; it replaces the old one only once
+    # the JSON is on disk, and an existing one is always rewritten so it never lags the JSON
+    with (make_ndjson.Writer(ndjson, head) if args.format == "ndjson" or os.path.exists(ndjson)
+          else contextlib.nullcontext()) as sink:
+        records, author_meta, authors, postings, notes = build_dataset(
+            hits, args.start, args.end, args.keep_nonconf,
+            args.page_filter_end_year, args.min_pages_pre2017,
+            use_numpy=False if args.no_numpy else None, state=state, sink=sink)
+
+        out = {**head, "records": records, "authorMeta": author_meta, "authors": authors,
+               "authorPostings": postings, "yearOffsets": year_offsets(records, args.start, args.end),
+               "notes": notes}
+
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        tmp = args.out + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False)
+        os.replace(tmp, args.out)  # atomic
+    if state is not None:
+        state.save(state_path)    # only once the dataset it describes is on disk
 
     yrs = sorted({r["year"] for r in records})
     print(f"\nWrote {args.out}: {len(records)} records, {len(authors)} authors, "
@@ -404,7 +457,17 @@ def main():
         print(f"  dropped {notes['skippedByPageLength']} short entries (poster page rule)")
     if notes["skippedNonConfOrEditorship"]:
         print(f"  dropped {notes['skippedNonConfOrEditorship']} editorship/non-conference entries")
-    print("Reload the dashboard to see the data.")
+    if "delta" in notes:
+        d = notes["delta"]
+        print(f"  delta: +{d['added']} -{d['removed']} ~{d['changed']} records, "
+              f"{len(d['authors'])} authors updated (state: {state_path})")
+    if args.build:
+        print("Building derived artifacts…")
+        build.run(out, args.out)
+        print("Reload the dashboard to see the data.")
+    else:
+        print("Run python3 build.py (or pass --build) to refresh the snapshot, the delta and "
+              "manifest, and the derived files.")
 
 
 if __name__ == "__main__":
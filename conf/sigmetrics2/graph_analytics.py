@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+graph_analytics.py - offline graph metrics for the SIGMETRICS coauthor network, too heavy
+to run in the browser on every range change:
+
+  - weighted PageRank (edge weight = joint papers), power iteration;
+  - k-core numbers (Batagelj-Zaversnik bucket algorithm, O(edges));
+  - approximate betweenness (Brandes from a fixed-seed sample of source authors);
+  - Louvain communities (local moving + aggregation) and their modularity.
+
+PageRank uses SciPy sparse matrices when SciPy is installed and plain adjacency arrays
+otherwise; the other three are pure Python. Results are precomputed for each decade (and
+the full range) and written to data/graph_metrics.json, which the Network view reads.
+"""
+import argparse
+import random
+import time
+from collections import deque
+
+from dataset import DEFAULT_DATA, write_json, load_papers, year_span
+from snapshot import load_dataset
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:            # optional: adjacency-array fallback below
+    np = sp = None
+
+DEFAULT_OUT = "data/graph_metrics.json"
+TOP_K = 25                     # authors listed per window
+BETWEENNESS_SAMPLES = 300      # source authors sampled for Brandes
+SEED = 7
+
+
+class CoauthorGraph:
+    """Undirected weighted coauthor graph over the papers of one window, in CSR form:
+    neighbours of node i are indices[indptr[i]:indptr[i+1]] with matching weights."""
+
+    def __init__(self, papers):
+        index, w = {}, {}
+        for p in papers:
+            ids = list(dict.fromkeys(p["ids"]))          # a repeated name is not a tie
+            for a in ids:
+                index.setdefault(a, len(index))
+            for i in range(len(ids)):
+                for j in range(i + 1, len(ids)):
+                    a, b = index[ids[i]], index[ids[j]]
+                    k = (a, b) if a < b else (b, a)
+                    w[k] = w.get(k, 0) + 1
+        self.ids = list(index)
+        self.n = n = len(self.ids)
+        nbrs = [[] for _ in range(n)]
+        for (a, b), c in w.items():
+            nbrs[a].append((b, c))
+            nbrs[b].append((a, c))
+        self.indptr, self.indices, self.weights = [0], [], []
+        for lst in nbrs:
+            lst.sort()
+            self.indices.extend(b for b, _ in lst)
+            self.weights.extend(c for _, c in lst)
+            self.indptr.append(len(self.indices))
+        self.edges = len(w)
+
+    def neighbors(self, i):
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[lo:hi], self.weights[lo:hi])
+
+    def degree(self, i):
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def strength(self):
+        return [sum(self.weights[self.indptr[i]:self.indptr[i + 1]]) for i in range(self.n)]
+
+    def adjacency_dicts(self):
+        return [dict(self.neighbors(i)) for i in range(self.n)]
+
+
+def pagerank(g, damping=0.85, tol=1e-10, max_iter=200):
+    """Weighted PageRank; authors without coauthors spread their rank uniformly."""
+    n = g.n
+    if not n:
+        return []
+    s = g.strength()
+    if sp is not None:
+        W = sp.csr_matrix((np.asarray(g.weights, dtype=float), g.indices, g.indptr), shape=(n, n))
+        s = np.asarray(s, dtype=float)
+        inv = np.divide(1.0, s, out=np.zeros(n), where=s > 0)
+        dangling = s == 0
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            # W is symmetric, so P^T x = W (x / s)
+            nx = damping * W.dot(x * inv) + (1 - damping + damping * x[dangling].sum()) / n
+            done = np.abs(nx - x).sum() < tol
+            x = nx
+            if done:
+                break
+        return x.tolist()
+    x = [1.0 / n] * n
+    for _ in range(max_iter):
+        nx = [0.0] * n
+        lost = 0.0
+        for i in range(n):
+            if not s[i]:
+                lost += x[i]
+                continue
+            share = damping * x[i] / s[i]
+            for j, w in g.neighbors(i):
+                nx[j] += share * w
+        base = (1 - damping + damping * lost) / n
+        nx = [v + base for v in nx]
+        err = sum(abs(a - b) for a, b in zip(nx, x))
+        x = nx
+        if err < tol:
+            break
+    return x
+
+
+def core_numbers(g):
+    """k-core number of every node (Batagelj & Zaversnik 2003)."""
+    n = g.n
+    deg = [g.degree(i) for i in range(n)]
+    if not n:
+        return []
+    md = max(deg)
+    bins = [0] * (md + 1)
+    for d in deg:
+        bins[d] += 1
+    start = 0
+    for d in range(md + 1):
+        bins[d], start = start, start + bins[d]
+    pos, vert = [0] * n, [0] * n
+    for v in range(n):
+        pos[v] = bins[deg[v]]
+        vert[pos[v]] = v
+        bins[deg[v]] += 1
+    for d in range(md, 0, -1):
+        bins[d] = bins[d - 1]
+    bins[0] = 0
+    for i in range(n):
+        v = vert[i]
+        for u in g.indices[g.indptr[v]:g.indptr[v + 1]]:
+            if deg[u] > deg[v]:
+                du, pu = deg[u], pos[u]
+                pw = bins[du]
+                w = vert[pw]
+                if u != w:
+                    pos[u], pos[w] = pw, pu
+                    vert[pu], vert[pw] = w, u
+                bins[du] += 1
+                deg[u] -= 1
+    return deg
+
+
+def approx_betweenness(g, samples=BETWEENNESS_SAMPLES, seed=SEED):
+    """Brandes betweenness (unweighted shortest paths) estimated from `samples` random
+    sources, scaled to the full graph and normalized to [0, 1]."""
+    n = g.n
+    bc = [0.0] * n
+    if n < 3:
+        return bc
+    sources = list(range(n))
+    if samples < n:
+        sources = random.Random(seed).sample(sources, samples)
+    indptr, indices = g.indptr, g.indices
+    for s in sources:
+        stack, preds = [], [[] for _ in range(n)]
+        sigma = [0] * n
+        dist = [-1] * n
+        sigma[s], dist[s] = 1, 0
+        q = deque([s])
+        while q:
+            v = q.popleft()
+            stack.append(v)
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if dist[w] < 0:
+                    dist[w] = dist[v] + 1
+                    q.append(w)
+                if dist[w] == dist[v] + 1:
+                    sigma[w] += sigma[v]
+                    preds[w].append(v)
+        delta = [0.0] * n
+        while stack:
+            w = stack.pop()
+            for v in preds[w]:
+                delta[v] += sigma[v] / sigma[w] * (1 + delta[w])
+            if w != s:
+                bc[w] += delta[w]
+    scale = (n / len(sources)) / ((n - 1) * (n - 2))     # undirected pairs, both directions counted
+    return [b * scale for b in bc]
+
+
+def louvain(g, seed=SEED):
+    """Louvain community detection. Returns (community label per node, modularity)."""
+    adj = g.adjacency_dicts()
+    n0 = g.n
+    membership = list(range(n0))
+    rnd = random.Random(seed)
+    while True:
+        n = len(adj)
+        k = [sum(a.values()) for a in adj]
+        m2 = float(sum(k))
+        if not m2:
+            break
+        comm, tot = list(range(n)), k[:]
+        order = list(range(n))
+        rnd.shuffle(order)
+        improved, moved = False, True
+        while moved:
+            moved = False
+            for i in order:
+                ci, ki = comm[i], k[i]
+                links = {}
+                for j, w in adj[i].items():
+                    if j != i:
+                        links[comm[j]] = links.get(comm[j], 0) + w
+                tot[ci] -= ki
+                best, gain = ci, links.get(ci, 0) - tot[ci] * ki / m2
+                for c, w in links.items():
+                    gc = w - tot[c] * ki / m2
+                    if gc > gain + 1e-12:
+                        best, gain = c, gc
+                tot[best] += ki
+                if best != ci:
+                    comm[i] = best
+                    moved = improved = True
+        if not improved:
+            break
+        relabel = {c: x for x, c in enumerate(dict.fromkeys(comm))}
+        comm = [relabel[c] for c in comm]
+        membership = [comm[c] for c in membership]
+        agg = [{} for _ in relabel]
+        for i in range(n):
+            ci = comm[i]
+            for j, w in adj[i].items():
+                cj = comm[j]
+                agg[ci][cj] = agg[ci].get(cj, 0) + w
+        adj = agg
+    return membership, modularity(g, membership)
+
+
+def modularity(g, labels):
+    m2 = float(sum(g.weights))
+    if not m2:
+        return 0.0
+    inside, tot = {}, {}
+    for i in range(g.n):
+        c = labels[i]
+        for j, w in g.neighbors(i):
+            tot[c] = tot.get(c, 0) + w
+            if labels[j] == c:
+                inside[c] = inside.get(c, 0) + w
+    return sum(inside.get(c, 0) / m2 - (t / m2) ** 2 for c, t in tot.items())
+
+
+def decade_windows(lo, hi):
+    """[(lo, hi)] plus each calendar decade clipped to the data range."""
+    out = [(lo, hi)]
+    start = lo
+    while start <= hi:
+        end = min(hi, start // 10 * 10 + 9)
+        out.append((start, end))
+        start = end + 1
+    return out
+
+
+def analyze(papers, top_k=TOP_K, samples=BETWEENNESS_SAMPLES):
+    g = CoauthorGraph(papers)
+    pr = pagerank(g)
+    core = core_numbers(g)
+    bc = approx_betweenness(g, samples)
+    labels, q = louvain(g)
+    sizes = {}
+    for c in labels:
+        sizes[c] = sizes.get(c, 0) + 1
+    ranked = sorted(sizes, key=lambda c: -sizes[c])
+    rank_of = {c: r + 1 for r, c in enumerate(ranked)}           # 1 = largest community
+    by_pr = sorted(range(g.n), key=lambda i: -pr[i])
+    by_bc = sorted(range(g.n), key=lambda i: -bc[i])
+    keep = list(dict.fromkeys(by_pr[:top_k] + by_bc[:top_k]))
+    members = {}
+    for i in by_pr:
+        members.setdefault(labels[i], []).append(i)
+    max_core = max(core) if core else 0
+    return {
+        "nodes": g.n, "edges": g.edges,
+        "maxCore": max_core, "maxCoreSize": sum(1 for c in core if c == max_core) if g.n else 0,
+        "modularity": round(q, 4),
+        "communities": [{"rank": rank_of[c], "size": sizes[c],
+                         "top": [g.ids[i] for i in members[c][:5]]}
+                        for c in ranked if sizes[c] > 1][:10],
+        "top": [{"id": g.ids[i], "pagerank": round(pr[i] * g.n, 4), "core": core[i],
+                 "betweenness": round(bc[i], 5), "community": rank_of[labels[i]]}
+                for i in keep],
+    }
+
+
+def build(raw, samples=BETWEENNESS_SAMPLES):
+    lo, hi = year_span(raw)
+    papers = load_papers(raw)
+    windows = []
+    for f, t in decade_windows(lo, hi):
+        res = analyze([p for p in papers if f <= p["year"] <= t], samples=samples)
+        windows.append({"from": f, "to": t, **res})
+    return {
+        "generatedAt": int(time.time() * 1000),
+        "fetchedAt": raw.get("fetchedAt") or 0,
+        "engine": "scipy.sparse" if sp is not None else "adjacency arrays",
+        "betweennessSamples": samples,
+        "note": ("pagerank is scaled so the average author scores 1.0; betweenness is "
+                 "normalized to [0,1] and estimated from sampled sources; community = size "
+                 "rank of the author's Louvain community (1 = largest)."),
+        "windows": windows,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Precompute PageRank / k-core / betweenness / communities per decade")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/graph_metrics.json)")
+    ap.add_argument("--samples", type=int, default=BETWEENNESS_SAMPLES,
+                    help=f"Source authors sampled for betweenness (default {BETWEENNESS_SAMPLES})")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    out = build(load_dataset(args.data), args.samples)
+    write_json(args.out, out)
+    print(f"Wrote {args.out}: {len(out['windows'])} windows via {out['engine']} in {time.time() - t0:.1f}s")
+    for w in out["windows"]:
+        print(f"  {w['from']}-{w['to']}: {w['nodes']} authors, {w['edges']} ties, "
+              f"max core {w['maxCore']}, modularity {w['modularity']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,12 +13,13 @@ import argparse
 import csv
 import json
 import os
-import re
-import unicodedata
 import urllib.request
 import time
 from typing import Dict, Optional, List
 
+from normalize import norm_name
+from snapshot import load_dataset
+
 CSRANKINGS_BASE = "https://raw.githubusercontent.com/emeryberger/CSRankings/gh-pages"
 CSRANKINGS_FILES = [f"csrankings-{chr(c)}.csv" for c in range(ord("a"), ord("z")+1)]
 
@@ -26,23 +27,6 @@ DEFAULT_SIGMETRICS_JSON = "data/sigmetrics.json"
 DEFAULT_OUT = "data/author_links.json"
 
 
-def _strip_accents(s: str) -> str:
-    return "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch))
-
-
-def norm_name(s: str) -> str:
-    if not s:
-        return ""
-    s = _strip_accents(s)
-    s = s.casefold().strip()
-    # drop dblp disambiguation suffix like ' 0001'
-    s = re.sub(r"\s+\d{4}$", "", s)
-    # remove punctuation
-    s = re.sub(r"[^\w\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-
 def read_json(path: str):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -106,20 +90,10 @@ def choose_best_csr_entry(csr_map: Dict[str, Dict[str, str]], names_to_try: List
     return None
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--sigmetrics", default=DEFAULT_SIGMETRICS_JSON, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
-    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/author_links.json)")
-    ap.add_argument("--timeout", type=int, default=30, help="HTTP timeout seconds (default: 30)")
-    args = ap.parse_args()
-
-    data = read_json(args.sigmetrics)
+def build_links(data: dict, csr_map: Dict[str, Dict[str, str]]) -> dict:
+    """author_links.json content for a loaded sigmetrics.json and a CSRankings name map."""
     author_meta = data.get("authorMeta") or {}
 
-    print("Loading CSRankings name map (one-time fetch)…")
-    csr_map = load_csrankings_map(timeout=args.timeout)
-    print(f"CSRankings entries loaded: {len(csr_map)}")
-
     byPid: Dict[str, Dict[str, str]] = {}
     byName: Dict[str, Dict[str, str]] = {}
 
@@ -155,7 +129,7 @@ def main():
             elif canonical:
                 byName[canonical] = links
 
-    out = {
+    return {
         "generatedAt": int(time.time() * 1000),
         "source": "CSRankings gh-pages/csrankings-*.csv (name→homepage+scholarid) + dblp pid from sigmetrics.json",
         "stats": {
@@ -168,6 +142,23 @@ def main():
         "byName": byName,
     }
 
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sigmetrics", default=DEFAULT_SIGMETRICS_JSON, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/author_links.json)")
+    ap.add_argument("--timeout", type=int, default=30, help="HTTP timeout seconds (default: 30)")
+    args = ap.parse_args()
+
+    data = load_dataset(args.sigmetrics)
+
+    print("Loading CSRankings name map (one-time fetch)…")
+    csr_map = load_csrankings_map(timeout=args.timeout)
+    print(f"CSRankings entries loaded: {len(csr_map)}")
+
+    out = build_links(data, csr_map)
+    byPid, byName = out["byPid"], out["byName"]
+
     out_path = args.out
     os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
     with open(out_path, "w", encoding="utf-8") as f:
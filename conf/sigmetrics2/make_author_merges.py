@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+make_author_merges.py - find authors that are split across several ids and write a merge
+map (data/author_merges.json). When dblp gives no pid, fetch_sigmetrics.py falls back to
+id = "name:<name>", so one person can appear under a pid id and a name id, or under
+several name ids, one per spelling.
+
+  1. Blocking: every author goes into one block per fuzzy key ("surname|first initial") of
+     each of their name variants. Only ids that share a block are ever compared, so the
+     work grows with the number of authors times the block size, not quadratically.
+  2. Scoring: each pair in a block with at least one name: id gets a score in [0, 1]:
+       NAME_W  * name    1 for a shared normalized name, .9 for the same first name with
+                         other middle names, .7 for a nickname / prefix (Don, Donald),
+                         .5 for initials only, 0 if the first names conflict
+       CO_W    * co      Jaccard of the two coauthor sets
+       YEAR_W  * years   1 when the active years overlap, falling to 0 over YEAR_DECAY years
+     Two ids on the same paper are different people and score 0. Two pid ids are never
+     compared, because dblp pids are authoritative.
+  3. Merging: pairs scoring at least --threshold are joined with a union-find, best pair
+     first. A name id whose two best pid candidates score within MARGIN of each other is
+     ambiguous and left alone. Two clusters are never joined if both hold a pid, or if
+     any of their members share a paper (two name ids that wrote together, say, must not
+     both join one pid through two separate pairs).
+
+Each cluster is named by its pid id, or else by its member with the most papers. The
+output maps every other member to it:
+
+  {format, fetchedAt, threshold, weights,
+   merges: {member id: {into, confidence}},     confidence = the score that joined it
+   clusters: [{into, members, confidence}],     confidence = the weakest join in the cluster
+   stats: {authors, nameIds, blocks, largestBlock, pairs, candidates, ambiguous, merged}}
+
+Nothing is rewritten: builders and the dashboard keep the ids they have. Use the map to
+audit splits, or to remap record author ids before building.
+
+  python3 make_author_merges.py [--data data/sigmetrics.json] [--threshold 0.6]
+"""
+import argparse
+import os
+import time
+
+from dataset import DEFAULT_DATA, write_json, load_papers
+from normalize import norm_name, first_last, fuzzy_key, first_compatible
+from snapshot import load_dataset
+from unionfind import UnionFind
+
+FORMAT = "sigmetrics-author-merges/1"
+DEFAULT_OUT = os.path.join("data", "author_merges.json")
+NAME_W, CO_W, YEAR_W = 0.45, 0.35, 0.20
+DEFAULT_THRESHOLD = 0.6
+MARGIN = 0.1
+YEAR_DECAY = 15
+
+
+def profiles(raw):
+    """{id: {names, co, first, last, pubs, papers}} from the counted papers and authorMeta."""
+    meta = raw.get("authorMeta") or {}
+    out = {}
+    for p in load_papers(raw):
+        ids = p["ids"]
+        for aid, name in zip(ids, p["names"]):
+            o = out.get(aid)
+            if o is None:
+                o = out[aid] = {"names": set(), "co": set(), "papers": set(), "pubs": 0,
+                                "first": p["year"], "last": p["year"]}
+            o["names"].add(norm_name(name))
+            o["co"].update(ids)
+            o["papers"].add(p["index"])
+            o["pubs"] += 1
+            o["first"], o["last"] = min(o["first"], p["year"]), max(o["last"], p["year"])
+    for aid, o in out.items():
+        m = meta.get(aid) or {}
+        o["names"].update(m.get("normNames") or [])
+        o["names"].discard("")
+        o["co"].discard(aid)
+    return out
+
+
+def blocks(prof):
+    """{fuzzy key: [ids]} over every name variant of every author."""
+    out = {}
+    for aid, o in prof.items():
+        for k in {fuzzy_key(n) for n in o["names"]}:
+            out.setdefault(k, []).append(aid)
+    return out
+
+
+def name_score(a, b):
+    if a & b:
+        return 1.0
+    best = 0.0
+    for x in a:
+        fx, lx = first_last(x)
+        for y in b:
+            fy, ly = first_last(y)
+            if lx != ly or not first_compatible(fx, fy):
+                continue
+            if len(fx) > 1 and len(fy) > 1:
+                best = max(best, 0.9 if fx == fy else 0.7)
+            else:
+                best = max(best, 0.5)
+    return best
+
+
+def score(a, b):
+    """(total, name, co, years) for two author profiles; total 0 if they cannot be one person."""
+    if a["papers"] & b["papers"]:
+        return 0.0, 0.0, 0.0, 0.0                        # coauthors of each other
+    name = name_score(a["names"], b["names"])
+    if not name:
+        return 0.0, 0.0, 0.0, 0.0
+    union = len(a["co"] | b["co"])
+    co = len(a["co"] & b["co"]) / union if union else 0.0
+    gap = max(0, max(a["first"], b["first"]) - min(a["last"], b["last"]))
+    years = max(0.0, 1 - gap / YEAR_DECAY)
+    return NAME_W * name + CO_W * co + YEAR_W * years, name, co, years
+
+
+def _is_pid(aid):
+    return aid.startswith("pid:")
+
+
+def build(raw, threshold=DEFAULT_THRESHOLD):
+    prof = profiles(raw)
+    blk = blocks(prof)
+    pairs, seen = [], set()
+    for ids in blk.values():
+        names = [i for i in ids if not _is_pid(i)]
+        for x in names:                                  # name id x against everyone else in the block
+            for y in ids:
+                key = (x, y) if x < y else (y, x)
+                if x == y or key in seen:
+                    continue                             # each pair once, across blocks too
+                seen.add(key)
+                s = score(prof[x], prof[y])[0]
+                if s >= threshold:
+                    pairs.append((s, key[0], key[1]))
+
+    # a name id with two pid candidates of nearly equal score could be either person
+    by_pid = {}
+    for s, x, y in pairs:
+        for n, other in ((x, y), (y, x)):
+            if not _is_pid(n) and _is_pid(other):
+                by_pid.setdefault(n, []).append(s)
+    ambiguous = {n for n, ss in by_pid.items() if len(ss) > 1 and sorted(ss)[-1] - sorted(ss)[-2] < MARGIN}
+
+    uf, pid_of, papers, joined = UnionFind(), {}, {}, {}
+    for aid, o in prof.items():
+        uf.add(aid)
+        papers[aid] = o["papers"]
+        if _is_pid(aid):
+            pid_of[aid] = aid
+    for s, x, y in sorted(pairs, key=lambda t: (-t[0], t[1], t[2])):
+        if x in ambiguous or y in ambiguous:
+            continue
+        rx, ry = uf.find(x), uf.find(y)
+        if rx == ry or (rx in pid_of and ry in pid_of):
+            continue                                     # never put two pids in one cluster
+        if not papers[rx].isdisjoint(papers[ry]):
+            continue                                     # nor two coauthors of one paper
+        pid = pid_of.pop(rx, None) or pid_of.pop(ry, None)
+        merged = papers.pop(rx) | papers.pop(ry)
+        root = uf.union(x, y)
+        papers[root] = merged
+        if pid:
+            pid_of[root] = pid
+        for n in (x, y):
+            joined[n] = max(joined.get(n, 0.0), s)
+
+    merges, clusters = {}, []
+    for root, members in uf.groups().items():
+        if len(members) < 2:
+            continue
+        into = pid_of.get(root) or min(members, key=lambda i: (-prof[i]["pubs"], i))
+        conf = {m: round(joined[m], 3) for m in members if m != into}
+        for m, c in conf.items():
+            merges[m] = {"into": into, "confidence": c}
+        clusters.append({"into": into, "members": sorted(conf), "confidence": min(conf.values())})
+    clusters.sort(key=lambda c: (-c["confidence"], c["into"]))
+    return {
+        "format": FORMAT, "fetchedAt": raw.get("fetchedAt") or 0, "threshold": threshold,
+        "weights": {"name": NAME_W, "coauthors": CO_W, "years": YEAR_W},
+        "merges": dict(sorted(merges.items())), "clusters": clusters,
+        "stats": {"authors": len(prof), "nameIds": sum(not _is_pid(a) for a in prof), "blocks": len(blk),
+                  "largestBlock": max(map(len, blk.values()), default=0), "pairs": len(seen),
+                  "candidates": len(pairs), "ambiguous": len(ambiguous), "merged": len(merges)},
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Find authors split across pid/name ids and write a merge map")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/author_merges.json)")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help=f"Minimum pair score to merge (default {DEFAULT_THRESHOLD})")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    out = build(load_dataset(args.data), args.threshold)
+    write_json(args.out, out, indent=1)
+    s = out["stats"]
+    print(f"Wrote {args.out}: {s['merged']} ids merged into {len(out['clusters'])} authors "
+          f"({s['nameIds']} name-only ids, {s['pairs']} pairs scored in {s['blocks']} blocks, "
+          f"{s['ambiguous']} ambiguous) in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
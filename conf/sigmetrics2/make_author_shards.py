@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+make_author_shards.py - write the per-author detail the dashboard's author page needs into
+small files under data/authors/, fetched only when a page opens:
+
+  data/authors/index.json   {fetchedAt, buckets, hash, authors}: tells the dashboard shards exist
+  data/authors/<bb>.json    {fetchedAt, authors: {id: detail}} for ids hashing to bucket bb
+
+Each author's detail is author_detail.build(): papers, coauthors by year, links and honors.
+
+Bucket = FNV-1a (32-bit, over the UTF-8 bytes of the author id) mod --buckets, as two or
+more lowercase hex digits.
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+from author_detail import build, fnv1a
+from dataset import DEFAULT_DATA, read_optional, write_json
+from snapshot import load_dataset
+
+DEFAULT_OUT_DIR = os.path.join("data", "authors")
+DEFAULT_BUCKETS = 256
+
+
+def bucket_name(aid, buckets):
+    width = max(2, len(f"{buckets - 1:x}"))
+    return f"{fnv1a(aid) % buckets:0{width}x}"
+
+
+def write_shards(detail, out_dir, buckets, fetched_at):
+    """Write the shards and index.json. A file whose content is unchanged keeps its bytes
+    (and its HTTP caches); only buckets of a previous layout are deleted. Returns (shards,
+    files written)."""
+    shards = {}
+    for aid, d in detail.items():
+        shards.setdefault(bucket_name(aid, buckets), {})[aid] = d
+    files = {b + ".json": {"fetchedAt": fetched_at, "authors": authors} for b, authors in shards.items()}
+    files["index.json"] = {"fetchedAt": fetched_at, "buckets": buckets, "hash": "fnv1a32-utf8",
+                           "authors": len(detail)}
+    for old in glob.glob(os.path.join(out_dir, "*.json")):
+        if os.path.basename(old) not in files:
+            os.remove(old)
+    written = 0
+    for name, obj in files.items():
+        path = os.path.join(out_dir, name)
+        if read_optional(path) != json.loads(json.dumps(obj)):
+            write_json(path, obj)
+            written += 1
+    return len(shards), written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write per-author detail shards for on-demand author pages")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Output directory (default: data/authors)")
+    ap.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS,
+                    help=f"Number of hash buckets (default {DEFAULT_BUCKETS})")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    raw = load_dataset(args.data)
+    detail = build(raw, os.path.dirname(args.data) or ".")
+    n, written = write_shards(detail, args.out_dir, args.buckets, raw.get("fetchedAt") or 0)
+    print(f"Wrote {n} shards for {len(detail)} authors to {args.out_dir}/ ({written} files changed) "
+          f"in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+make_bootstrap.py - write a copy of index.html (index.boot.html) whose first view needs no
+download: the full-range Overview (stat cards, every chart series, the submissions section
+and the header readouts) is computed here and embedded as an inline JSON block, and the
+page renders it at once while data/sigmetrics.json loads in the background.
+
+The block fills index.html's empty <script type="application/json" id="bootstrap">:
+
+  {format, version, fetchedAt, startYear, endYear, sample, totalRecords, totalAuthors,
+   comm: aggregateWindow()'s comm for startYear-endYear, submissions}
+
+comm comes from window_index.Index.overview, the same numbers /api/overview returns.
+`version` is a SHA-256 (16 hex digits) of the dataset and submissions.json the block was
+computed from. It is also written to data/bootstrap.json, which the page fetches (a few
+bytes, never cached): when the two differ, or the dataset that arrives has another
+fetchedAt, the inline figures are marked as out of date until the live ones replace them.
+
+index.html itself is left untouched (its block stays empty and it loads as before); deploy
+index.boot.html as the site's index.html. Re-run after every fetch (build.py does).
+
+  python3 make_bootstrap.py [--data data/sigmetrics.json] [--html index.html] [--out index.boot.html]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+
+from dataset import DEFAULT_DATA, read_json, write_json, record_authors
+from snapshot import load_dataset
+from window_index import Index
+
+FORMAT = "sigmetrics-bootstrap/1"
+DEFAULT_HTML = "index.html"
+DEFAULT_OUT = "index.boot.html"
+BLOCK = re.compile(r'(<script type="application/json" id="bootstrap">)(.*?)(</script>)', re.S)
+
+
+def version(data_path, data_dir):
+    h = hashlib.sha256(FORMAT.encode())
+    for path in (data_path, os.path.join(data_dir, "submissions.json")):
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"-")
+    return h.hexdigest()[:16]
+
+
+def build(raw, data_dir="data", ver=""):
+    """The inline block's content."""
+    idx = Index(raw, data_dir)
+    f, t = idx.full_min, idx.full_max
+    comm = idx.overview(f, t, idx.author_rows(f, t))
+    del comm["topConnected"]                             # the Overview does not show it
+    comm["lorenz"] = [[round(x, 4), round(y, 4)] for x, y in comm["lorenz"]]
+    try:
+        submissions = read_json(os.path.join(data_dir, "submissions.json"))
+    except (OSError, ValueError):
+        submissions = None
+    recs = raw.get("records") or []
+    return {"format": FORMAT, "version": ver, "fetchedAt": raw.get("fetchedAt") or 0,
+            "startYear": f, "endYear": t, "sample": bool(raw.get("sample")),
+            "totalRecords": len(recs), "totalAuthors": len({a for r in recs for a, _, _ in record_authors(r)}),
+            "comm": comm, "submissions": submissions}
+
+
+def inject(html, boot):
+    """html with the bootstrap block filled; "<" is escaped so the JSON cannot end the script."""
+    body = json.dumps(boot, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+    out, n = BLOCK.subn(lambda m: m.group(1) + body + m.group(3), html, count=1)
+    if not n:
+        raise ValueError('no <script type="application/json" id="bootstrap"> block in the page')
+    return out
+
+
+def write(raw, data_path=DEFAULT_DATA, html_path=DEFAULT_HTML, out=DEFAULT_OUT):
+    data_dir = os.path.dirname(data_path) or "."
+    ver = version(data_path, data_dir)
+    boot = build(raw, data_dir, ver)
+    with open(html_path, encoding="utf-8") as f:
+        page = inject(f.read(), boot)
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(page)
+    os.replace(tmp, out)
+    write_json(os.path.join(data_dir, "bootstrap.json"), {"format": FORMAT, "version": ver,
+                                                          "fetchedAt": boot["fetchedAt"]})
+    return boot
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write index.html with the full-range Overview embedded inline")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--html", default=DEFAULT_HTML, help="Page to copy (default: index.html)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output page (default: index.boot.html)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    boot = write(load_dataset(args.data), args.data, args.html, args.out)
+    size = len(json.dumps(boot, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    print(f"Wrote {args.out}: {boot['startYear']}–{boot['endYear']} Overview inline ({size} bytes, "
+          f"version {boot['version']}) in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+make_coauthor_csr.py - write the coauthor graph as NumPy .npy CSR arrays that analytics
+code opens with np.load(mmap_mode="r"): startup costs the same whatever the graph size, and
+neighbourhood and degree queries are slices of the mapped files, not copies.
+
+  data/coauthor_csr/
+    indptr.npy   int64[n+1]  neighbours of node i are indices[indptr[i]:indptr[i+1]], sorted
+    indices.npy  int32[2m]   neighbour node (each undirected edge is stored both ways)
+    weight.npy   int32[2m]   joint papers
+    first.npy    int16[2m]   year of the first joint paper
+    last.npy     int16[2m]   year of the last joint paper
+    id_bytes.npy, id_ptr.npy     author ids as UTF-8 bytes: node i is id_bytes[id_ptr[i]:id_ptr[i+1]]
+    name_bytes.npy, name_ptr.npy canonical names, likewise
+    by_id.npy    int32[n]    nodes sorted by id bytes, for id -> node lookups by bisection
+    graph.json   {format, fetchedAt, nodes, edges}, written last
+
+Nodes are authors in first-appearance order over the papers the dashboard counts (as in
+graph_analytics.CoauthorGraph); authors with only solo papers are nodes of degree 0. The
+edges are built from a flat array of (author, coauthor, year) pairs with one sort and
+reduceat, never dicts of sets. NumPy is required.
+
+  g = CoauthorCSR("data/coauthor_csr")
+  i = g.code("pid:g/ErolGelenbe")
+  g.degree(i), g.neighborhood(i)     # (indices, weight, first, last) views
+
+--check also builds graph_analytics.CoauthorGraph from the dataset and verifies that
+pagerank, core_numbers, approx_betweenness and louvain agree on the two graph classes.
+"""
+import argparse
+import bisect
+import os
+import time
+from array import array
+from functools import cached_property
+from itertools import combinations
+
+from dataset import DEFAULT_DATA, read_json, write_json, load_papers
+from snapshot import load_dataset
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORMAT = "sigmetrics-coauthor-csr/2"
+DEFAULT_OUT = "data/coauthor_csr"
+EDGE_ARRAYS = ("indices", "weight", "first", "last")
+ARRAYS = ("indptr",) + EDGE_ARRAYS + ("id_bytes", "id_ptr", "name_bytes", "name_ptr", "by_id")
+
+
+def _need_numpy():
+    if np is None:
+        raise SystemExit("make_coauthor_csr.py needs NumPy (pip install numpy)")
+
+
+def _strings(values):
+    """(uint8 blob, int64 offsets) for a list of strings."""
+    blobs = [v.encode("utf-8") for v in values]
+    ptr = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in blobs], out=ptr[1:])
+    return np.frombuffer(b"".join(blobs), dtype=np.uint8), ptr
+
+
+def build(raw):
+    """{name: array} for every file above except graph.json, plus "nodes" and "edges"."""
+    _need_numpy()
+    meta = raw.get("authorMeta") or {}
+    index, names = {}, []
+    src, dst, yrs = array("i"), array("i"), array("h")
+    for p in load_papers(raw):
+        codes = []
+        for aid, name in dict(zip(p["ids"], p["names"])).items():    # a repeated name is not a tie
+            if aid not in index:
+                index[aid] = len(index)
+                names.append((meta.get(aid) or {}).get("canonicalName") or name)
+            codes.append(index[aid])
+        for a, b in combinations(codes, 2):
+            src.append(a)
+            dst.append(b)
+        yrs.extend([p["year"]] * (len(src) - len(yrs)))
+    n = len(index)
+    a, b = np.frombuffer(src, dtype=np.int32), np.frombuffer(dst, dtype=np.int32)
+    year = np.frombuffer(yrs, dtype=np.int16)
+    key = np.concatenate([a, b]).astype(np.int64) * max(n, 1) + np.concatenate([b, a])
+    year = np.concatenate([year, year])
+    order = np.argsort(key, kind="stable")
+    key, year = key[order], year[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if len(key) else np.zeros(0, dtype=np.int64)
+    ukey = key[starts]
+    owner = (ukey // max(n, 1)).astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner, minlength=n), out=indptr[1:])
+    ids = list(index)
+    id_bytes = [i.encode("utf-8") for i in ids]
+    out = {
+        "indptr": indptr,
+        "indices": (ukey % max(n, 1)).astype(np.int32),
+        "weight": np.diff(np.r_[starts, len(key)]).astype(np.int32),
+        "first": np.minimum.reduceat(year, starts) if len(starts) else year[:0],
+        "last": np.maximum.reduceat(year, starts) if len(starts) else year[:0],
+        "by_id": np.array(sorted(range(n), key=id_bytes.__getitem__), dtype=np.int32),
+        "nodes": n, "edges": len(starts) // 2,
+    }
+    out["id_bytes"], out["id_ptr"] = _strings(ids)
+    out["name_bytes"], out["name_ptr"] = _strings(names)
+    return out
+
+
+def write(graph, out_dir, fetched_at=0):
+    """Save the arrays (each atomically), then graph.json, which readers check them against."""
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ARRAYS:
+        tmp = os.path.join(out_dir, name + ".tmp.npy")
+        np.save(tmp, np.ascontiguousarray(graph[name]))
+        os.replace(tmp, os.path.join(out_dir, name + ".npy"))
+    write_json(os.path.join(out_dir, "graph.json"),
+               {"format": FORMAT, "fetchedAt": fetched_at, "nodes": graph["nodes"], "edges": graph["edges"]})
+
+
+class CoauthorCSR:
+    """The graph under `path`, memory-mapped. Offers the interface graph_analytics uses
+    (n, edges, ids, indptr, indices, weights, neighbors, degree, strength, adjacency_dicts)
+    plus array views. `ids` decodes every id on first use; id(i) decodes one."""
+
+    def __init__(self, path=DEFAULT_OUT):
+        _need_numpy()
+        meta = read_json(os.path.join(path, "graph.json"))
+        if meta.get("format") != FORMAT:
+            raise ValueError(f"{path}: unsupported format {meta.get('format')!r}")
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, name + ".npy"), mmap_mode="r"))
+        self.n, self.edges, self.fetched_at = meta["nodes"], meta["edges"], meta.get("fetchedAt")
+        if len(self.indptr) != self.n + 1 or len(self.indices) != 2 * self.edges \
+                or any(len(getattr(self, k)) != len(self.indices) for k in EDGE_ARRAYS):
+            raise ValueError(f"{path}: arrays do not match graph.json (partly rewritten?)")
+        self.weights = self.weight
+
+    def id(self, i):
+        return bytes(self.id_bytes[self.id_ptr[i]:self.id_ptr[i + 1]]).decode("utf-8")
+
+    @cached_property
+    def ids(self):
+        blob, ptr = bytes(self.id_bytes), self.id_ptr.tolist()
+        return [blob[ptr[i]:ptr[i + 1]].decode("utf-8") for i in range(self.n)]
+
+    def name(self, i):
+        return bytes(self.name_bytes[self.name_ptr[i]:self.name_ptr[i + 1]]).decode("utf-8")
+
+    def code(self, author_id):
+        """Node of an author id, or None: a bisection over by_id, O(log n) decodes."""
+        want = author_id.encode("utf-8")
+        key = lambda j: bytes(self.id_bytes[self.id_ptr[j]:self.id_ptr[j + 1]])
+        k = bisect.bisect_left(self.by_id, want, key=key)
+        if k < self.n and key(self.by_id[k]) == want:
+            return int(self.by_id[k])
+        return None
+
+    def degree(self, i):
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def degrees(self):
+        return np.diff(self.indptr)
+
+    def neighborhood(self, i):
+        """(indices, weight, first, last) of node i: views into the mapped files."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return tuple(getattr(self, k)[lo:hi] for k in EDGE_ARRAYS)
+
+    def neighbors(self, i):
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[lo:hi].tolist(), self.weight[lo:hi].tolist())
+
+    def strength(self):
+        total = np.zeros(len(self.weight) + 1, dtype=np.int64)
+        np.cumsum(self.weight, out=total[1:])
+        return total[self.indptr[1:]] - total[self.indptr[:-1]]
+
+    def adjacency_dicts(self):
+        indptr, indices, weight = self.indptr.tolist(), self.indices.tolist(), self.weight.tolist()
+        return [dict(zip(indices[indptr[i]:indptr[i + 1]], weight[indptr[i]:indptr[i + 1]])) for i in range(self.n)]
+
+
+def check(raw, path=DEFAULT_OUT):
+    """Names of the graph_analytics results that differ between CoauthorGraph built from
+    `raw` and the CoauthorCSR under `path` (empty when they agree)."""
+    import graph_analytics as ga
+    a, b = ga.CoauthorGraph(load_papers(raw)), CoauthorCSR(path)
+    close = lambda x, y: len(x) == len(y) and all(abs(float(u) - float(v)) <= 1e-9 for u, v in zip(x, y))
+    bad = [k for k, same in (("n", a.n == b.n), ("edges", a.edges == b.edges), ("ids", a.ids == b.ids)) if not same]
+    if bad:
+        return bad
+    for name, fn in (("pagerank", ga.pagerank), ("core_numbers", ga.core_numbers),
+                     ("approx_betweenness", ga.approx_betweenness)):
+        if not close(fn(a), fn(b)):
+            bad.append(name)
+    (la, qa), (lb, qb) = ga.louvain(a), ga.louvain(b)
+    if la != lb or abs(qa - qb) > 1e-9:
+        bad.append("louvain")
+    return bad
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write the coauthor graph as memory-mappable .npy CSR arrays")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output directory (default: data/coauthor_csr)")
+    ap.add_argument("--check", action="store_true",
+                    help="Verify graph_analytics gives the same results on CoauthorCSR and CoauthorGraph")
+    args = ap.parse_args()
+
+    _need_numpy()
+    t0 = time.time()
+    raw = load_dataset(args.data)
+    graph = build(raw)
+    write(graph, args.out, raw.get("fetchedAt") or 0)
+    t1 = time.time()
+    CoauthorCSR(args.out).degrees().max(initial=0)
+    print(f"Wrote {args.out}/: {graph['nodes']} authors, {graph['edges']} coauthor pairs in {t1 - t0:.1f}s "
+          f"(opens in {(time.time() - t1) * 1000:.1f} ms)")
+    if args.check:
+        bad = check(raw, args.out)
+        if bad:
+            raise SystemExit("CoauthorCSR and CoauthorGraph differ: " + ", ".join(bad))
+        print("Checked: pagerank, core_numbers, approx_betweenness and louvain agree with CoauthorGraph")
+
+
+if __name__ == "__main__":
+    main()
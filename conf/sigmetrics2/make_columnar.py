@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+make_columnar.py - export records, authorships and authors as columnar files for joining
+SIGMETRICS with other venues in DuckDB, pandas or polars without walking the nested JSON.
+
+With pyarrow installed each table is one dictionary-encoded, zstd-compressed Parquet file
+(or Arrow IPC with --format ipc):
+
+  data/columnar/records.parquet      id, key, year, title, norm_title, venue, type, team_size, alphabetical
+  data/columnar/authorships.parquet  record_id, author_id, position, team_size, year, alphabetical
+  data/columnar/authors.parquet      id, pid, name, pubs, first_auth, last_auth, solo, coauthors,
+                                     avg_team, active_years, first_year, last_year
+
+Without pyarrow the NumPy fallback writes data/columnar/<table>/<column>.npy instead:
+numbers as int32/float64 (-1 / NaN for missing), strings dictionary-encoded as int32 codes
+(-1 for missing) plus <column>.dict.json with the values. data/columnar/schema.json lists
+the tables, columns, row counts and which engine wrote them.
+
+Ids and columns match make_sqlite.py: record_id is the record's index in sigmetrics.json,
+authorships cover the records every dashboard metric counts, and `alphabetical` is the
+dashboard's isAlphabetical. read_table() loads only the columns asked for, from either layout.
+"""
+import argparse
+import json
+import os
+import time
+
+from dataset import DEFAULT_DATA, read_json, write_json, load_papers, is_alphabetical
+from normalize import norm_text
+from snapshot import load_dataset
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:            # optional: NumPy column files below
+    pa = ipc = pq = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORMAT = "sigmetrics-columnar/1"
+DEFAULT_OUT = os.path.join("data", "columnar")
+EXT = {"parquet": ".parquet", "ipc": ".arrow"}
+
+# table -> [(column, type)]; type is int, float, bool or str
+SCHEMA = {
+    "records": [("id", "int"), ("key", "str"), ("year", "int"), ("title", "str"), ("norm_title", "str"),
+                ("venue", "str"), ("type", "str"), ("team_size", "int"), ("alphabetical", "bool")],
+    "authorships": [("record_id", "int"), ("author_id", "str"), ("position", "int"), ("team_size", "int"),
+                    ("year", "int"), ("alphabetical", "bool")],
+    "authors": [("id", "str"), ("pid", "str"), ("name", "str"), ("pubs", "int"), ("first_auth", "int"),
+                ("last_auth", "int"), ("solo", "int"), ("coauthors", "int"), ("avg_team", "float"),
+                ("active_years", "int"), ("first_year", "int"), ("last_year", "int")],
+}
+
+
+def tables(raw):
+    """{table: {column: [values]}} in SCHEMA order."""
+    alpha = {p["index"]: is_alphabetical(p["names"]) for p in load_papers(raw)}
+    cols = {t: {c: [] for c, _ in spec} for t, spec in SCHEMA.items()}
+    rec = cols["records"]
+    for i, r in enumerate(raw.get("records") or []):
+        for c, v in (("id", i), ("key", r.get("key") or ""), ("year", int(r["year"])), ("title", r.get("title") or ""),
+                     ("norm_title", r.get("normTitle") or norm_text(r.get("title"))), ("venue", r.get("venue")),
+                     ("type", r.get("type")), ("team_size", len(r.get("authors") or [])),
+                     ("alphabetical", alpha.get(i, False))):
+            rec[c].append(v)
+    ships = cols["authorships"]
+    for p in load_papers(raw):
+        for pos, aid in enumerate(p["ids"]):
+            for c, v in (("record_id", p["index"]), ("author_id", aid), ("position", pos),
+                         ("team_size", len(p["ids"])), ("year", p["year"]), ("alphabetical", alpha[p["index"]])):
+                ships[c].append(v)
+    au = cols["authors"]
+    keys = {"first_auth": "firstAuth", "last_auth": "lastAuth", "avg_team": "avgTeam",
+            "active_years": "activeYears", "first_year": "firstYear", "last_year": "lastYear"}
+    for a in raw.get("authors") or []:
+        for c, _ in SCHEMA["authors"]:
+            au[c].append(a.get("name") or a["id"] if c == "name" else a.get(keys.get(c, c)))
+    return cols
+
+
+def _arrow_table(name, data):
+    arrays = []
+    for c, kind in SCHEMA[name]:
+        v = data[c]
+        if kind == "str":
+            arrays.append(pa.array(v, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(v, {"int": pa.int32(), "float": pa.float64(), "bool": pa.bool_()}[kind]))
+    return pa.table(arrays, names=[c for c, _ in SCHEMA[name]])
+
+
+def _write_numpy(path, name, data):
+    out = os.path.join(path, name)
+    os.makedirs(out, exist_ok=True)
+    for c, kind in SCHEMA[name]:
+        v = data[c]
+        if kind == "str":
+            values = list(dict.fromkeys(x for x in v if x is not None))
+            code = {x: i for i, x in enumerate(values)}
+            arr = np.array([-1 if x is None else code[x] for x in v], dtype=np.int32)
+            write_json(os.path.join(out, c + ".dict.json"), values)
+        elif kind == "float":
+            arr = np.array([np.nan if x is None else x for x in v], dtype=np.float64)
+        else:
+            arr = np.array([-1 if x is None else x for x in v], dtype=np.bool_ if kind == "bool" else np.int32)
+        np.save(os.path.join(out, c + ".tmp.npy"), arr)
+        os.replace(os.path.join(out, c + ".tmp.npy"), os.path.join(out, c + ".npy"))
+
+
+def engine():
+    return "pyarrow" if pa is not None else "numpy" if np is not None else None
+
+
+def write(raw, path=DEFAULT_OUT, fmt="parquet"):
+    """Write every table to `path` with the best engine available; returns schema.json's content."""
+    eng = engine()
+    if eng is None:
+        raise RuntimeError("make_columnar.py needs pyarrow or NumPy")
+    os.makedirs(path, exist_ok=True)
+    cols, info = tables(raw), {}
+    for name, data in cols.items():
+        if eng == "pyarrow":
+            dest = os.path.join(path, name + EXT[fmt])
+            t = _arrow_table(name, data)
+            if fmt == "parquet":
+                pq.write_table(t, dest + ".tmp", compression="zstd", use_dictionary=True)
+            else:
+                with ipc.new_file(dest + ".tmp", t.schema, options=ipc.IpcWriteOptions(compression="zstd")) as w:
+                    w.write_table(t)
+            os.replace(dest + ".tmp", dest)
+        else:
+            _write_numpy(path, name, data)
+        info[name] = {"rows": len(data[SCHEMA[name][0][0]]), "columns": SCHEMA[name]}
+    schema = {"format": FORMAT, "engine": eng, "layout": fmt if eng == "pyarrow" else "npy",
+              "fetchedAt": raw.get("fetchedAt") or 0, "tables": info}
+    write_json(os.path.join(path, "schema.json"), schema, indent=1)
+    return schema
+
+
+def read_table(name, columns=None, path=DEFAULT_OUT):
+    """Only the requested columns of one table: a pyarrow.Table for Parquet / IPC output,
+    else {column: numpy array} (strings decoded from their dictionaries)."""
+    schema = read_json(os.path.join(path, "schema.json"))
+    columns = list(columns or [c for c, _ in schema["tables"][name]["columns"]])
+    layout = schema["layout"]
+    if layout != "npy":
+        if pa is None:
+            raise RuntimeError(f"{path} was written by pyarrow; install pyarrow to read it")
+        dest = os.path.join(path, name + EXT[layout])
+        if layout == "parquet":
+            return pq.read_table(dest, columns=columns)
+        with pa.memory_map(dest) as src:
+            return ipc.open_file(src).read_all().select(columns)
+    kinds = dict(schema["tables"][name]["columns"])
+    out = {}
+    for c in columns:
+        arr = np.load(os.path.join(path, name, c + ".npy"), mmap_mode="r")
+        if kinds[c] == "str":
+            with open(os.path.join(path, name, c + ".dict.json"), encoding="utf-8") as f:
+                values = np.array(json.load(f) + [None], dtype=object)
+            arr = values[arr]                                  # code -1 -> the trailing None
+        out[c] = arr
+    return out
+
+
+def papers_by_year(path=DEFAULT_OUT):
+    """{year: (papers, alphabetical papers)} from two authorship columns: the read this
+    layout is for (and the timing main() prints)."""
+    t = read_table("authorships", ["record_id", "year", "alphabetical", "position"], path)
+    cols = {c: np.asarray(t[c]) for c in ("year", "alphabetical", "position")}
+    first = cols["position"] == 0
+    years, papers = np.unique(cols["year"][first], return_counts=True)
+    alpha = np.bincount(np.searchsorted(years, cols["year"][first & cols["alphabetical"]]), minlength=len(years))
+    return {int(y): (int(n), int(a)) for y, n, a in zip(years, papers, alpha)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export records/authorships/authors as Parquet, Arrow IPC or .npy columns")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output directory (default: data/columnar)")
+    ap.add_argument("--format", choices=sorted(EXT), default="parquet", help="Layout when pyarrow is installed")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    schema = write(load_dataset(args.data), args.out, args.format)
+    t1 = time.time()
+    by_year = papers_by_year(args.out)
+    print(f"Wrote {args.out}/ ({schema['layout']} via {schema['engine']}): "
+          + ", ".join(f"{t['rows']} {n}" for n, t in schema["tables"].items())
+          + f" in {t1 - t0:.1f}s; papers per year over {len(by_year)} years read back in "
+          f"{(time.time() - t1) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
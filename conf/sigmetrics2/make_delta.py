@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+make_delta.py - publish a compact delta between two versions of data/sigmetrics.json, so a
+returning visitor can update the copy the dashboard keeps in the browser instead of
+downloading the whole dataset again.
+
+A version is the dataset's fetchedAt. Records are matched by dblp key (author_stats.record_ids)
+and authors by id:
+
+  data/deltas/<from>-<to>.json
+      {format, from, to, set: {top-level fields}, counts: {records, authors},
+       records:    {removed: [record id], upsert: [[record id, record]]},
+       authorMeta: {removed: [author id], upsert: {id: meta}},
+       authors:    {removed: [author id], upsert: [author row]}}
+  data/manifest.json
+      {format, latest, snapshot, bytes, deltas: [{from, to, file, bytes}]}
+
+authorPostings and yearOffsets are not shipped: they follow from the records, and apply()
+(and index.html applyDelta) rebuild them. build.py's `delta` stage calls publish_next():
+it diffs the dataset against the copy it kept at its last run (data/.delta_base.json,
+git-ignored), then keeps the new one. Run this script by hand to diff two saved files.
+"""
+import argparse
+import glob
+import os
+
+from author_stats import record_ids
+from dataset import DEFAULT_DATA, author_postings, read_json, write_json, year_offsets
+
+FORMAT = "sigmetrics-delta/1"
+DEFAULT_KEEP = 8
+BASE = ".delta_base.json"
+DERIVED = ("authorPostings", "yearOffsets")
+DIFFED = ("records", "authorMeta", "authors") + DERIVED
+
+
+def _diff_map(old, new):
+    """(removed keys, {key: value} added or changed) between two dicts."""
+    return [k for k in old if k not in new], {k: v for k, v in new.items() if old.get(k) != v}
+
+
+def diff(old, new):
+    old_recs = dict(zip(record_ids(old.get("records") or []), old.get("records") or []))
+    new_recs = dict(zip(record_ids(new["records"]), new["records"]))
+    rec_removed, rec_upsert = _diff_map(old_recs, new_recs)
+    meta_removed, meta_upsert = _diff_map(old.get("authorMeta") or {}, new.get("authorMeta") or {})
+    old_rows = {a["id"]: a for a in old.get("authors") or []}
+    new_rows = {a["id"]: a for a in new.get("authors") or []}
+    row_removed, row_upsert = _diff_map(old_rows, new_rows)
+    return {
+        "format": FORMAT, "from": old.get("fetchedAt") or 0, "to": new.get("fetchedAt") or 0,
+        "set": {k: v for k, v in new.items() if k not in DIFFED},
+        "counts": {"records": len(new["records"]), "authors": len(new_rows)},
+        "records": {"removed": rec_removed, "upsert": [[k, v] for k, v in rec_upsert.items()]},
+        "authorMeta": {"removed": meta_removed, "upsert": meta_upsert},
+        "authors": {"removed": row_removed, "upsert": list(row_upsert.values())},
+    }
+
+
+def apply(old, delta):
+    """The dataset `delta` turns `old` into (index.html applyDelta does the same)."""
+    if delta.get("format") != FORMAT or delta["from"] != (old.get("fetchedAt") or 0):
+        raise ValueError(f"delta {delta.get('from')}->{delta.get('to')} does not apply to {old.get('fetchedAt')}")
+    gone = set(delta["records"]["removed"])
+    recs = {k: r for k, r in zip(record_ids(old["records"]), old["records"]) if k not in gone}
+    recs.update(delta["records"]["upsert"])
+    records = sorted(recs.values(), key=lambda r: (r["year"], r["key"]))
+
+    meta = {k: v for k, v in (old.get("authorMeta") or {}).items() if k not in set(delta["authorMeta"]["removed"])}
+    meta.update(delta["authorMeta"]["upsert"])
+    gone = set(delta["authors"]["removed"])
+    rows = {a["id"]: a for a in old.get("authors") or [] if a["id"] not in gone}
+    rows.update((a["id"], a) for a in delta["authors"]["upsert"])
+    order = dict.fromkeys(aid for r in records for aid in r["authorIds"])
+    authors = [rows[aid] for aid in order if aid in rows]
+
+    out = {k: v for k, v in old.items() if k not in DIFFED}
+    out.update(delta["set"])
+    out.update(records=records, authorMeta=meta, authors=authors)
+    out["authorPostings"] = author_postings(records)
+    if out.get("startYear") and out.get("endYear"):
+        out["yearOffsets"] = year_offsets(records, out["startYear"], out["endYear"])
+    if (len(records), len(authors)) != (delta["counts"]["records"], delta["counts"]["authors"]):
+        raise ValueError("delta applied with wrong record/author counts")
+    return out
+
+
+def publish(old, new, data_dir="data", snapshot="sigmetrics.json", keep=DEFAULT_KEEP):
+    """Write the old -> new delta (when `old` is a different version) and the manifest,
+    keeping only the newest `keep` deltas. Returns the new delta's path or None."""
+    path = None
+    manifest = _read_manifest(os.path.join(data_dir, "manifest.json"))
+    deltas = manifest.get("deltas") or []
+    if old and old.get("records") is not None and not old.get("sample") \
+            and (old.get("fetchedAt") or 0) != (new.get("fetchedAt") or 0):
+        d = diff(old, new)
+        name = f"deltas/{d['from']}-{d['to']}.json"
+        path = os.path.join(data_dir, name)
+        write_json(path, d)
+        deltas = [x for x in deltas if x["to"] != d["to"]] + [
+            {"from": d["from"], "to": d["to"], "file": name, "bytes": os.path.getsize(path)}]
+    deltas = deltas[-keep:] if keep > 0 else []
+    live = {os.path.normpath(os.path.join(data_dir, x["file"])) for x in deltas}
+    for f in glob.glob(os.path.join(data_dir, "deltas", "*.json")):
+        if os.path.normpath(f) not in live:
+            os.remove(f)
+    snap = os.path.join(data_dir, snapshot)
+    write_json(os.path.join(data_dir, "manifest.json"),
+               {"format": FORMAT, "latest": new.get("fetchedAt") or 0, "snapshot": snapshot,
+                "bytes": os.path.getsize(snap) if os.path.exists(snap) else None, "deltas": deltas},
+               indent=2)
+    return path
+
+
+def publish_next(new, data_dir="data", snapshot="sigmetrics.json", keep=DEFAULT_KEEP):
+    """publish() against the dataset this function last saw, which it then replaces with
+    `new`. Without a saved copy (first run, fresh checkout) only the manifest is written.
+    Sample data gets no manifest at all, so browsers never cache it."""
+    base = os.path.join(data_dir, BASE)
+    if new.get("sample"):
+        for f in (os.path.join(data_dir, "manifest.json"), base):
+            if os.path.exists(f):
+                os.remove(f)
+        return None
+    try:
+        old = read_json(base)
+    except (OSError, ValueError):
+        old = None
+    path = publish(old, new, data_dir, snapshot, keep)
+    write_json(base, new)
+    return path
+
+
+def _read_manifest(path):
+    try:
+        m = read_json(path)
+    except (OSError, ValueError):
+        return {}
+    return m if m.get("format") == FORMAT else {}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Publish a sigmetrics.json delta and update data/manifest.json")
+    ap.add_argument("--old", default=None, help="Previous dataset (omit to only (re)write the manifest)")
+    ap.add_argument("--new", default=DEFAULT_DATA, help="Current dataset (default: data/sigmetrics.json)")
+    ap.add_argument("--keep", type=int, default=DEFAULT_KEEP,
+                    help=f"Deltas kept in the manifest chain (default {DEFAULT_KEEP})")
+    args = ap.parse_args()
+
+    new = read_json(args.new)
+    old = read_json(args.old) if args.old else None
+    path = publish(old, new, os.path.dirname(args.new) or ".", os.path.basename(args.new), args.keep)
+    if path:
+        d = read_json(path)
+        apply(old, d)                                   # fails loudly if the delta is unusable
+        print(f"Wrote {path}: +{len(d['records']['upsert'])} -{len(d['records']['removed'])} records, "
+              f"{len(d['authors']['upsert'])} author rows, {os.path.getsize(path)} bytes "
+              f"(snapshot {os.path.getsize(args.new)} bytes)")
+    print(f"Wrote {os.path.join(os.path.dirname(args.new) or '.', 'manifest.json')}: latest {new.get('fetchedAt')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+make_ndjson.py - write the dataset as newline-delimited JSON (data/sigmetrics.ndjson), so
+index.html can parse it as it downloads and show the Overview counts before the last byte
+arrives, however large the dataset gets.
+
+One JSON array per line, tagged by its first element:
+
+  ["h", {format, counts: {records}, set: {top-level fields}}]       first
+  ["r", record]                               in (year, key) order, right after the header
+  ["m", author id, authorMeta entry]          one per author
+  ["a", author row]                           sigmetrics.json "authors", in order
+  ["s", {top-level fields}]                   fields known only once the rest is written
+                                              (the fetcher's notes), merged into the header's
+  ["e", {records, authors}]                   last: counts again, so a cut-off download is
+                                              never mistaken for the dataset
+
+authorPostings and yearOffsets are left out, as in make_delta.py: they follow from the
+records and readers rebuild them. Writer puts each item on disk as it is handed over and
+keeps nothing but counters, so fetch_sigmetrics.build_dataset streams the records into it
+as soon as they are sorted, without assembling the dataset dict first. read() reassembles
+sigmetrics.json's dict from a file.
+
+  python3 make_ndjson.py [--data data/sigmetrics.json] [--out data/sigmetrics.ndjson]
+"""
+import argparse
+import json
+import os
+import time
+
+from dataset import DEFAULT_DATA, author_postings, year_offsets
+from snapshot import load_dataset
+
+FORMAT = "sigmetrics-ndjson/2"
+DEFAULT_OUT = os.path.join("data", "sigmetrics.ndjson")
+SECTIONS = ("records", "authorMeta", "authors", "authorPostings", "yearOffsets")
+
+
+def _line(*item):
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class Writer:
+    """The file, written one line at a time: begin() (the header, with the record count),
+    then record() in year order, then meta(), author() and fields() in any order. Leaving the
+    `with` block writes the end line and moves the file into place; on an exception the
+    partial file is removed and the previous one kept."""
+
+    def __init__(self, path, fields):
+        self.path, self.set = path, fields
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._f = open(path + ".tmp", "w", encoding="utf-8")
+        self.records = self.authors = 0
+
+    def begin(self, n_records):
+        self._f.write(_line("h", {"format": FORMAT, "counts": {"records": n_records}, "set": self.set}))
+
+    def record(self, r):
+        self._f.write(_line("r", r))
+        self.records += 1
+
+    def meta(self, aid, m):
+        self._f.write(_line("m", aid, m))
+
+    def author(self, a):
+        self._f.write(_line("a", a))
+        self.authors += 1
+
+    def fields(self, d):
+        self._f.write(_line("s", d))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._f.write(_line("e", {"records": self.records, "authors": self.authors}))
+        self._f.close()
+        if exc_type is None:
+            os.replace(self.path + ".tmp", self.path)
+        else:
+            os.remove(self.path + ".tmp")
+        return False
+
+
+def write(raw, path=DEFAULT_OUT):
+    """Write `raw` (sigmetrics.json's dict) to `path`."""
+    recs = raw.get("records") or []
+    in_order = all(recs[i - 1]["year"] <= recs[i]["year"] for i in range(1, len(recs)))
+    with Writer(path, {k: v for k, v in raw.items() if k not in SECTIONS}) as w:
+        w.begin(len(recs))
+        for i in range(len(recs)) if in_order else sorted(range(len(recs)), key=lambda i: (recs[i]["year"], recs[i].get("key") or "")):
+            w.record(recs[i])
+        for aid, m in (raw.get("authorMeta") or {}).items():
+            w.meta(aid, m)
+        for a in raw.get("authors") or []:
+            w.author(a)
+    return path
+
+
+def read(path=DEFAULT_OUT):
+    """sigmetrics.json's dict from an .ndjson file, derived sections rebuilt."""
+    out, end = None, None
+    with open(path, encoding="utf-8") as f:
+        for ln in f:
+            item = json.loads(ln)
+            tag = item[0]
+            if tag == "h":
+                if item[1].get("format") != FORMAT:
+                    raise ValueError(f"{path}: unsupported format {item[1].get('format')!r}")
+                out = {**item[1]["set"], "records": [], "authorMeta": {}, "authors": []}
+            elif tag == "m":
+                out["authorMeta"][item[1]] = item[2]
+            elif tag == "r":
+                out["records"].append(item[1])
+            elif tag == "a":
+                out["authors"].append(item[1])
+            elif tag == "s":
+                out.update(item[1])
+            elif tag == "e":
+                end = item[1]
+    if out is None or end != {"records": len(out["records"]), "authors": len(out["authors"])}:
+        raise ValueError(f"{path}: truncated")
+    if all("authorIds" in r for r in out["records"]):
+        out["authorPostings"] = author_postings(out["records"])
+    if out.get("startYear") and out.get("endYear"):
+        out["yearOffsets"] = year_offsets(out["records"], out["startYear"], out["endYear"])
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write sigmetrics.json as NDJSON for progressive loading")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/sigmetrics.ndjson)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    raw = load_dataset(args.data)
+    write(raw, args.out)
+    print(f"Wrote {args.out}: {len(raw.get('records') or [])} records, {os.path.getsize(args.out)} bytes "
+          f"in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
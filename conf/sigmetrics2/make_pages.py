@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+make_pages.py - pre-render a static HTML page per author, plus a few summary pages, so a
+shared author link opens instantly and crawlers can index every author:
+
+  pages/author/<slug>.html   name, honors, links, stats, role breakdown, an inline SVG
+                             trajectory and ego network, and the full paper list
+  pages/index.html           A-Z directory of every author
+  pages/top.html             the most published authors
+  pages/honors.html          everyone with an award, chair or officer role
+  pages/style.css
+  pages/pages.json           {format, version, fetchedAt, pages: {id: [file, hash]}}, written last
+
+Each page is rendered from a payload holding exactly what it shows (author_detail's
+detail with the papers and coauthor names filled in), and the sha256 of that payload is
+kept in pages.json. A rebuild renders only the pages whose hash changed or whose file is
+missing, and deletes the pages of authors who are gone, so a refresh that adds a handful
+of papers rewrites a handful of files. Author pages carry no build date for the same
+reason; the summary pages do. Bump VERSION when a template changes.
+
+Rendering runs in a process pool (--jobs, default: CPU count; 1 = serial). Every page links
+back to the dashboard's #author/<id> view, which has the year-window controls.
+
+  python3 make_pages.py [--data data/sigmetrics.json] [--out pages] [--force] [--jobs N]
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+from author_detail import build as build_detail, fnv1a
+from dataset import DEFAULT_DATA, read_json, write_json, load_papers, is_alphabetical
+from snapshot import load_dataset
+
+FORMAT = "sigmetrics-pages/1"
+VERSION = 1
+DEFAULT_OUT = "pages"
+DASHBOARD = "../index.html"        # relative to pages/
+TOP_N = 100
+EGO_K = 14
+BATCH = 64                         # pages per pool task
+
+AWARD = {"achievement": "Achievement Award", "rising": "Rising Star", "doctoral": "Doctoral Dissertation Award"}
+CHAIR = {"general": "General Chair", "program": "PC Chair"}
+
+STYLE = """\
+:root{--paper:#FBFBFD;--surface:#FFFFFF;--surface-2:#F5F6F9;--line:#E7E9EF;--line-strong:#D4D8E1;
+  --ink:#15181F;--muted:#6A7184;--faint:#9AA1B2;--accent:#0C8593;--accent-strong:#0A6B76;
+  --accent-soft:#E0F2F4;--needle:#D9801C;--pc:#6A52C2;--c-auth:#3A4256;
+  --mono:ui-monospace,"SF Mono",Menlo,Consolas,monospace;
+  --sans:"Inter",system-ui,-apple-system,"Segoe UI",Roboto,Helvetica,Arial,sans-serif}
+*{box-sizing:border-box}
+body{margin:0;background:var(--paper);color:var(--ink);font:15px/1.5 var(--sans)}
+a{color:var(--accent-strong);text-decoration:none}
+a:hover{text-decoration:underline}
+main{max-width:980px;margin:0 auto;padding:24px 20px 60px}
+nav{font-family:var(--mono);font-size:12px;color:var(--muted)}
+h1{margin:10px 0 4px;font-size:28px}
+h2{margin:30px 0 10px;font-size:17px}
+.sub{color:var(--muted)}
+.chip{display:inline-block;margin:4px 6px 0 0;padding:2px 9px;border:1px solid var(--line);
+  border-radius:99px;background:var(--surface);font-size:12.5px}
+.stats{display:grid;grid-template-columns:repeat(auto-fill,minmax(120px,1fr));gap:10px;margin-top:18px}
+.stat{background:var(--surface);border:1px solid var(--line);border-radius:10px;padding:10px 12px}
+.stat .v{font-family:var(--mono);font-size:20px}
+.stat .k{font-size:11px;color:var(--muted);text-transform:uppercase;letter-spacing:.06em}
+.card{background:var(--surface);border:1px solid var(--line);border-radius:10px;padding:14px}
+svg{max-width:100%;height:auto}
+.axis{font:10px var(--mono);fill:var(--muted)}
+.warn{color:var(--needle)}
+ul.papers{list-style:none;margin:0;padding:0}
+ul.papers li{padding:8px 0;border-bottom:1px solid var(--line)}
+ul.papers .m{font-size:13px;color:var(--muted)}
+.yr{font-family:var(--mono)}
+table{width:100%;border-collapse:collapse;background:var(--surface)}
+th,td{padding:6px 10px;border-bottom:1px solid var(--line);text-align:right;font-family:var(--mono);font-size:13px}
+th.l,td.l{text-align:left;font-family:var(--sans)}
+.letters a{font-family:var(--mono);margin-right:8px}
+.dir{columns:3 220px;font-size:14px}
+.dir div{break-inside:avoid}
+"""
+
+
+def slugs(ids):
+    """{author id: file name stem}: the id with runs of other characters turned into "-",
+    plus an FNV-1a suffix if two ids would collide."""
+    base = {aid: re.sub(r"[^A-Za-z0-9]+", "-", aid).strip("-")[:80] or "author" for aid in ids}
+    seen = {}
+    for aid in sorted(ids):
+        seen.setdefault(base[aid].lower(), []).append(aid)
+    out = {}
+    for group in seen.values():
+        for aid in group:
+            out[aid] = base[aid] if len(group) == 1 else f"{base[aid]}-{fnv1a(aid):08x}"
+    return out
+
+
+def payloads(raw, data_dir):
+    """{author id: page payload}. A payload is plain JSON and holds every value its page
+    shows, so its hash decides whether the page must be rendered again."""
+    detail = build_detail(raw, data_dir)
+    recs, rows = raw.get("records") or [], {a["id"]: a for a in raw.get("authors") or []}
+    alpha = {p["index"]: is_alphabetical(p["names"]) for p in load_papers(raw)}
+    slug = slugs(detail)
+    names = {}
+    for aid in detail:
+        row = rows.get(aid) or {}
+        m = (raw.get("authorMeta") or {}).get(aid) or {}
+        names[aid] = row.get("name") or m.get("canonicalName") or m.get("name") or aid
+    out = {}
+    for aid, d in detail.items():
+        row = rows.get(aid) or {}
+        papers, roles, by_year, multi, alpha_n = [], {"first": 0, "middle": 0, "last": 0, "solo": 0}, {}, 0, 0
+        for i, pos, size in d["papers"]:
+            r = recs[i]
+            roles[pos] += 1
+            by_year[r["year"]] = by_year.get(r["year"], 0) + 1
+            if size > 1:
+                multi += 1
+                alpha_n += alpha.get(i, False)
+            papers.append({"title": r.get("title") or "", "year": r["year"], "venue": r.get("venue") or "",
+                           "pages": r.get("pages") or "", "pos": pos,
+                           "href": r.get("ee") or r.get("url") or (f"https://doi.org/{r['doi']}" if r.get("doi") else ""),
+                           "authors": [[a.get("name") or "", slug.get(a.get("id"))]
+                                       for a in r.get("authors") or [] if isinstance(a, dict)]})
+        joint = sorted(((sum(ys.values()), c) for c, ys in d["coauthors"].items()), key=lambda t: (-t[0], t[1]))
+        top = [c for _, c in joint[:EGO_K]]
+        pos_of = {c: k for k, c in enumerate(top)}
+        links = sorted({(min(pos_of[c], pos_of[o]), max(pos_of[c], pos_of[o]))
+                        for c in top for o in detail[c]["coauthors"] if o in pos_of and o != c})
+        out[aid] = {
+            "id": aid, "slug": slug[aid], "name": names[aid],
+            "aliases": [a for a in row.get("aliases") or [] if a != names[aid]],
+            "stats": {k: row.get(k) for k in ("pubs", "firstAuth", "lastAuth", "solo", "coauthors", "avgTeam",
+                                              "activeYears", "firstYear", "lastYear")},
+            "roles": roles, "alphaRate": round(alpha_n / multi, 3) if multi else 0,
+            "byYear": sorted(by_year.items()), "links": d["links"], "honors": d.get("honors") or {},
+            "ego": {"nodes": [[slug[c], names[c], n] for n, c in joint[:EGO_K]], "links": [list(l) for l in links]},
+            "papers": papers,
+        }
+    return out
+
+
+def page_hash(payload):
+    blob = json.dumps([VERSION, payload], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------- templates
+
+def _page(title, body, depth, description=""):
+    up = "../" * depth
+    meta = f'<meta name="description" content="{escape(description)}">\n' if description else ""
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+            f"<title>{escape(title)}</title>\n{meta}"
+            f'<link rel="stylesheet" href="{up}style.css">\n</head>\n<body><main>\n'
+            f'<nav><a href="{up}{DASHBOARD}">SIGMETRICS dashboard</a> · <a href="{up}index.html">All authors</a>'
+            f' · <a href="{up}top.html">Most published</a> · <a href="{up}honors.html">Honors</a></nav>\n'
+            f"{body}\n</main></body>\n</html>\n")
+
+
+def _years_label(years):
+    out, i = [], 0
+    while i < len(years):
+        j = i
+        while j + 1 < len(years) and years[j + 1] == years[j] + 1:
+            j += 1
+        out.append(str(years[i]) if i == j else f"{years[i]}–{years[j]}")
+        i = j + 1
+    return ", ".join(out)
+
+
+def _honor_chips(h):
+    chips = [f"{AWARD.get(e['type'], e['type'])} {e['year']}" for e in h.get("awards") or []]
+    chips += [f"{CHAIR.get(e['role'], e['role'])} {e['year']}" for e in h.get("chairs") or []]
+    chips += [f"{e['role']} {'(current)' if e.get('current') else e.get('term') or ''}".strip()
+              for e in h.get("officers") or []]
+    if h.get("pc"):
+        chips.append("Program Committee " + _years_label(h["pc"]))
+    return "".join(f'<span class="chip">{escape(c)}</span>' for c in chips)
+
+
+def trajectory_svg(by_year, w=560, h=170):
+    if not by_year:
+        return ""
+    lo, hi = by_year[0][0], by_year[-1][0]
+    counts, top = dict(by_year), max(n for _, n in by_year)
+    pl, pr, pt, pb = 26, 8, 10, 22
+    bw = (w - pl - pr) / (hi - lo + 1)
+    g = [f'<line x1="{pl}" y1="{h - pb}" x2="{w - pr}" y2="{h - pb}" stroke="#D4D8E1"/>',
+         f'<text class="axis" x="{pl - 4}" y="{pt + 8}" text-anchor="end">{top}</text>']
+    for k, y in enumerate(range(lo, hi + 1)):
+        n = counts.get(y, 0)
+        if n:
+            bh = (h - pt - pb) * n / top
+            g.append(f'<rect x="{pl + k * bw + 1:.1f}" y="{h - pb - bh:.1f}" width="{max(bw - 2, 1):.1f}" '
+                     f'height="{bh:.1f}" fill="#0C8593"><title>{y}: {n} paper{"s" if n > 1 else ""}</title></rect>')
+    step = max(1, math.ceil((hi - lo + 1) / 8))
+    for y in range(lo, hi + 1, step):
+        g.append(f'<text class="axis" x="{pl + (y - lo + .5) * bw:.1f}" y="{h - 6}" text-anchor="middle">{y}</text>')
+    return f'<svg viewBox="0 0 {w} {h}" role="img" aria-label="Papers per year">{"".join(g)}</svg>'
+
+
+def roles_svg(roles, w=560, h=34):
+    total = sum(roles.values()) or 1
+    colors = {"first": "#0C8593", "middle": "#9AA1B2", "last": "#3A4256", "solo": "#D9801C"}
+    g, x = [], 0.0
+    for k in ("first", "middle", "last", "solo"):
+        n = roles[k]
+        if not n:
+            continue
+        bw = w * n / total
+        g.append(f'<rect x="{x:.1f}" y="0" width="{bw:.1f}" height="{h - 14}" fill="{colors[k]}"><title>{k}: {n}</title></rect>')
+        if bw > 60:
+            g.append(f'<text class="axis" x="{x + 4:.1f}" y="{h - 2}">{k} {n}</text>')
+        x += bw
+    return f'<svg viewBox="0 0 {w} {h}" role="img" aria-label="Authorship positions">{"".join(g)}</svg>'
+
+
+def ego_svg(p, w=560, h=420):
+    nodes = p["ego"]["nodes"]
+    if not nodes:
+        return '<p class="sub">No coauthors — solo contributor.</p>'
+    cx, cy, r = w / 2, h / 2, min(w, h) / 2 - 46
+    top = max(n for _, _, n in nodes)
+    xy = [(cx + r * math.cos(-math.pi / 2 + k / len(nodes) * 2 * math.pi),
+           cy + r * math.sin(-math.pi / 2 + k / len(nodes) * 2 * math.pi)) for k in range(len(nodes))]
+    g = [f'<line x1="{xy[i][0]:.1f}" y1="{xy[i][1]:.1f}" x2="{xy[j][0]:.1f}" y2="{xy[j][1]:.1f}" stroke="#E7E9EF"/>'
+         for i, j in p["ego"]["links"]]
+    for (slug, name, n), (x, y) in zip(nodes, xy):
+        g.append(f'<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}" stroke="#D4D8E1" stroke-width="{.6 + n / top * 2:.2f}"/>')
+    for (slug, name, n), (x, y) in zip(nodes, xy):
+        rad = 6 + n / top * 9
+        ty = y - rad - 5 if y < cy else y + rad + 12
+        g.append(f'<a href="{escape(slug)}.html"><circle cx="{x:.1f}" cy="{y:.1f}" r="{rad:.1f}" fill="#0C8593" opacity=".85">'
+                 f'<title>{escape(name)}: {n} joint paper{"s" if n > 1 else ""}</title></circle>'
+                 f'<text class="axis" x="{x:.1f}" y="{ty:.1f}" text-anchor="middle">{escape(name.split(" ")[-1])}</text></a>')
+    initials = "".join(s[:1] for s in p["name"].split())[:3]
+    g.append(f'<circle cx="{cx}" cy="{cy}" r="13" fill="#D9801C"/>'
+             f'<text x="{cx}" y="{cy + 4}" text-anchor="middle" font-size="10" fill="#fff">{escape(initials)}</text>')
+    return f'<svg viewBox="0 0 {w} {h}" role="img" aria-label="Top coauthors">{"".join(g)}</svg>'
+
+
+def render_author(p):
+    s = p["stats"]
+    span = f"{s['firstYear']}–{s['lastYear']}" if s.get("firstYear") else ""
+    links = "".join(f'<a class="chip" href="{escape(p["links"][k])}" rel="noopener">{label} ↗</a>'
+                    for k, label in (("dblp", "DBLP"), ("homepage", "Homepage"), ("googleScholar", "Scholar"))
+                    if p["links"].get(k))
+    dash = f'../{DASHBOARD}#author/{escape(p["id"])}'
+    stats = "".join(f'<div class="stat"><div class="v">{v}</div><div class="k">{k}</div></div>' for k, v in (
+        ("Papers", s.get("pubs") or 0), ("First author", s.get("firstAuth") or 0),
+        ("Last author", s.get("lastAuth") or 0), ("Solo", s.get("solo") or 0),
+        ("Coauthors", s.get("coauthors") or 0), ("Avg team", f"{s.get('avgTeam') or 0:.1f}"),
+        ("Active years", s.get("activeYears") or 0)))
+    caveat = (f'<p class="warn">{p["alphaRate"] * 100:.0f}% of multi-author papers list authors alphabetically, '
+              f"so first/last position says little here.</p>" if p["alphaRate"] > .4 else "")
+    items = []
+    for q in p["papers"]:
+        title = escape(q["title"])
+        if q["href"]:
+            title = f'<a href="{escape(q["href"])}" rel="noopener">{title}</a>'
+        names = ", ".join(f'<a href="{escape(sl)}.html">{escape(n)}</a>' if sl and sl != p["slug"] else escape(n)
+                          for n, sl in q["authors"])
+        extra = " · ".join(x for x in (escape(q["venue"]), f"pp. {escape(q['pages'])}" if q["pages"] else "", q["pos"]) if x)
+        items.append(f'<li><div>{title}</div><div class="m"><span class="yr">{q["year"]}</span> · {names}'
+                     f"{' · ' + extra if extra else ''}</div></li>")
+    aliases = f'<div class="sub">Also published as {escape(", ".join(p["aliases"]))}</div>' if p["aliases"] else ""
+    body = (f"<h1>{escape(p['name'])}</h1>{aliases}"
+            f'<div class="sub">{s.get("pubs") or 0} SIGMETRICS papers{" · " + span if span else ""} · '
+            f'<a href="{dash}">open in the dashboard</a></div>'
+            f"<div>{_honor_chips(p['honors'])}{links}</div>"
+            f'<div class="stats">{stats}</div>'
+            f'<h2>Trajectory</h2><div class="card">{trajectory_svg(p["byYear"])}</div>'
+            f'<h2>Authorship position</h2><div class="card">{roles_svg(p["roles"])}{caveat}</div>'
+            f'<h2>Top coauthors</h2><div class="card">{ego_svg(p)}</div>'
+            f'<h2>Papers</h2><ul class="papers">{"".join(items)}</ul>')
+    desc = f"{p['name']}: {s.get('pubs') or 0} SIGMETRICS papers{', ' + span if span else ''}."
+    return _page(f"{p['name']} · SIGMETRICS authors", body, 1, desc)
+
+
+def _surname(name):
+    parts = re.sub(r"\s+\d{4}$", "", name).split()
+    return (parts[-1] if parts else name).lower()
+
+
+def render_summaries(pays, fetched_at):
+    """{file name: html} for the summary pages."""
+    stamp = time.strftime("%Y-%m-%d", time.gmtime(fetched_at / 1000)) if fetched_at else "unknown"
+    stamp = f'<p class="sub">{len(pays)} authors · data as of {stamp}</p>'
+    ordered = sorted(pays.values(), key=lambda p: (_surname(p["name"]), p["name"].lower()))
+    letters = {}
+    for p in ordered:
+        letters.setdefault((_surname(p["name"])[:1] or "#").upper(), []).append(p)
+    link = lambda p: f'<a href="author/{escape(p["slug"])}.html">{escape(p["name"])}</a>'
+    body = [f"<h1>SIGMETRICS authors</h1>{stamp}",
+            '<p class="letters">' + "".join(f'<a href="#l-{escape(k)}">{escape(k)}</a>' for k in letters) + "</p>"]
+    for k, ps in letters.items():
+        body.append(f'<h2 id="l-{escape(k)}">{escape(k)}</h2><div class="dir">'
+                    + "".join(f'<div>{link(p)} <span class="sub">{p["stats"].get("pubs") or 0}</span></div>' for p in ps)
+                    + "</div>")
+    out = {"index.html": _page("SIGMETRICS authors", "".join(body), 0, "Every author of a SIGMETRICS paper.")}
+
+    top = sorted(pays.values(), key=lambda p: (-(p["stats"].get("pubs") or 0), p["name"]))[:TOP_N]
+    rows = "".join(f'<tr><td>{k}</td><td class="l">{link(p)}</td><td>{p["stats"].get("pubs") or 0}</td>'
+                   f'<td>{p["stats"].get("firstYear") or ""}–{p["stats"].get("lastYear") or ""}</td>'
+                   f'<td>{p["stats"].get("coauthors") or 0}</td></tr>' for k, p in enumerate(top, 1))
+    out["top.html"] = _page("Most published SIGMETRICS authors",
+                            f"<h1>Most published authors</h1>{stamp}<table><tr><th>#</th><th class=\"l\">Author</th>"
+                            f"<th>Papers</th><th>Span</th><th>Coauthors</th></tr>{rows}</table>", 0)
+
+    honored = [p for p in ordered if p["honors"].get("awards") or p["honors"].get("chairs") or p["honors"].get("officers")]
+    rows = "".join(f'<tr><td class="l">{link(p)}</td><td class="l">{_honor_chips({k: v for k, v in p["honors"].items() if k != "pc"})}</td></tr>'
+                   for p in honored)
+    out["honors.html"] = _page("SIGMETRICS honors",
+                               f"<h1>Awards, chairs and officers</h1>{stamp}<table>{rows}</table>", 0)
+    return out
+
+
+# ------------------------------------------------------------------------------- output
+
+def _write(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _render_batch(out_dir, batch):
+    """Render and write a list of payloads (one pool task)."""
+    for p in batch:
+        _write(os.path.join(out_dir, "author", p["slug"] + ".html"), render_author(p))
+    return len(batch)
+
+
+def build(raw, data_dir="data", out_dir=DEFAULT_OUT, force=False, jobs=None):
+    """Bring out_dir up to date; returns {"authors", "rendered", "removed"}."""
+    pays = payloads(raw, data_dir)
+    os.makedirs(os.path.join(out_dir, "author"), exist_ok=True)
+    manifest_path = os.path.join(out_dir, "pages.json")
+    try:
+        old = read_json(manifest_path)
+        if (old.get("format"), old.get("version")) != (FORMAT, VERSION):
+            old = {}
+    except (OSError, ValueError):
+        old = {}
+    prev = old.get("pages") or {}
+    pages, todo = {}, []
+    for aid, p in pays.items():
+        f, h = p["slug"] + ".html", page_hash(p)
+        pages[aid] = [f, h]
+        if force or prev.get(aid) != [f, h] or not os.path.exists(os.path.join(out_dir, "author", f)):
+            todo.append(p)
+    keep = {f for f, _ in pages.values()}
+    removed = 0
+    for aid, (f, _) in prev.items():
+        if f not in keep and os.path.exists(os.path.join(out_dir, "author", f)):
+            os.remove(os.path.join(out_dir, "author", f))
+            removed += 1
+    batches = [todo[i:i + BATCH] for i in range(0, len(todo), BATCH)]
+    if jobs != 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            list(pool.map(_render_batch, [out_dir] * len(batches), batches))
+    else:
+        for b in batches:
+            _render_batch(out_dir, b)
+    for name, html in [("style.css", STYLE), *render_summaries(pays, raw.get("fetchedAt") or 0).items()]:
+        path = os.path.join(out_dir, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                if f.read() == html:
+                    continue
+        except OSError:
+            pass
+        _write(path, html)
+    write_json(manifest_path, {"format": FORMAT, "version": VERSION, "fetchedAt": raw.get("fetchedAt") or 0,
+                               "pages": pages}, indent=0)
+    return {"authors": len(pages), "rendered": len(todo), "removed": removed}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pre-render static author pages and summary pages")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output directory (default: pages)")
+    ap.add_argument("--force", action="store_true", help="Render every page, changed or not")
+    ap.add_argument("--jobs", type=int, help="Worker processes (default: CPU count; 1 = serial)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    raw = load_dataset(args.data)
+    n = build(raw, os.path.dirname(args.data) or ".", args.out, args.force, args.jobs)
+    print(f"Wrote {args.out}/: {n['rendered']} of {n['authors']} author pages rendered, "
+          f"{n['removed']} removed in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
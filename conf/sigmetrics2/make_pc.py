@@ -9,7 +9,9 @@ chairs), so it marks PC service in the author dashboard without any DBLP refetch
 Rosters live as one-name-per-line files in pc_raw/yYYYY.txt. Edit those (or this header)
 when a year is corrected, then re-run.
 """
-import json, os, time, re, unicodedata
+import json, os, time, re
+
+from normalize import pc_key as norm_key   # same key the dashboard matches names by
 
 # Host city per edition (for the PC page header), consistent with chairs.json.
 LOCATION = {
@@ -34,17 +36,6 @@ LOCATION = {
 
 RAW_DIR = "pc_raw"
 
-def norm_key(name):
-    """Normalization key for de-duplication and matching:
-    strip accents, lowercase, drop parenthetical nicknames and punctuation."""
-    s = unicodedata.normalize("NFKD", name)
-    s = "".join(c for c in s if not unicodedata.combining(c))
-    s = re.sub(r"\(.*?\)", " ", s)          # drop "(Kevin)" etc.
-    s = s.replace(".", " ").replace("-", " ")
-    s = re.sub(r"[^a-zA-Z ]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip().lower()
-    return s
-
 def clean_display(name):
     """Tidy display form: collapse whitespace, fix ALL-CAPS surnames."""
     name = re.sub(r"\s+", " ", name).strip()
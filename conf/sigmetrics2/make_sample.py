@@ -132,6 +132,11 @@ out = {
 os.makedirs(os.path.dirname(OUT), exist_ok=True)
 with open(OUT, "w", encoding="utf-8") as f:
     json.dump(out, f, ensure_ascii=False, separators=(",", ":"))
+# a manifest and NDJSON stream left by build.py describe the real dataset; drop
+# them so browsers load the sample instead of a cached copy or the old stream
+for stale in ("manifest.json", "sigmetrics.ndjson"):
+    if os.path.exists(os.path.join(os.path.dirname(OUT), stale)):
+        os.remove(os.path.join(os.path.dirname(OUT), stale))
 
 # a small sample author_links.json (homepage + scholar for a subset) to show the UI
 byPid = {}
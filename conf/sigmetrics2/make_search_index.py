@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+make_search_index.py - write data/search_index.json, a prebuilt inverted index the dashboard
+uses for the Authors search box (names and aliases) and for paper-title search.
+
+  - author names: every canonical name and alias, normalized like index.html normName
+    (accents stripped, lowercase, punctuation collapsed). A sorted token vocabulary answers
+    prefix queries; a character-trigram index answers substring queries ("n lee", "gelen").
+  - paper titles: tokenized like normTitle, minus a few stop words; prefix queries run
+    against the sorted title vocabulary.
+
+Author documents are numbered by total paper count (most prolific first), so doc order is
+also the default relevance tie-break. Title documents are record indices into
+raw["records"]. Every posting list is a sorted integer array stored delta-encoded: the first
+value is absolute, each next one is the gap from its predecessor.
+"""
+import argparse
+import time
+
+from dataset import DEFAULT_DATA, write_json, load_papers
+from snapshot import load_dataset
+from normalize import norm_name, norm_text
+
+DEFAULT_OUT = "data/search_index.json"
+
+STOP_WORDS = frozenset("a an and as at by for from in into of on or the to via with".split())
+
+
+def delta_encode(sorted_ints):
+    out, prev = [], 0
+    for v in sorted_ints:
+        out.append(v - prev)
+        prev = v
+    return out
+
+
+def delta_decode(gaps):
+    out, acc = [], 0
+    for g in gaps:
+        acc += g
+        out.append(acc)
+    return out
+
+
+def trigrams(text):
+    """Character trigrams of a normalized string, padded so prefixes and suffixes of each
+    word get their own grams."""
+    t = " " + text + " "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+def _postings(term_docs):
+    """{term: set(doc)} -> (sorted terms, parallel delta-encoded posting lists)."""
+    terms = sorted(term_docs)
+    return terms, [delta_encode(sorted(term_docs[t])) for t in terms]
+
+
+def build(raw):
+    papers = load_papers(raw)
+    meta = raw.get("authorMeta") or {}
+
+    pubs, names = {}, {}
+    for p in papers:
+        for aid, name in zip(p["ids"], p["names"]):
+            pubs[aid] = pubs.get(aid, 0) + 1
+            names.setdefault(aid, name)
+    authors = sorted(pubs, key=lambda a: (-pubs[a], a))
+
+    texts, name_terms, grams = [], {}, {}
+    for doc, aid in enumerate(authors):
+        m = meta.get(aid) or {}
+        variants = [m.get("canonicalName"), m.get("name"), names[aid], *(m.get("aliases") or [])]
+        keys = list(dict.fromkeys(k for k in (norm_name(v) for v in variants if v) if k))
+        texts.append("|".join(keys))
+        for k in keys:
+            for tok in k.split():
+                name_terms.setdefault(tok, set()).add(doc)
+            for g in trigrams(k):
+                grams.setdefault(g, set()).add(doc)
+
+    title_terms = {}
+    for p in papers:
+        for tok in norm_text(p["title"]).split():
+            if tok not in STOP_WORDS:
+                title_terms.setdefault(tok, set()).add(p["index"])
+
+    nt, npost = _postings(name_terms)
+    tt, tpost = _postings(title_terms)
+    return {
+        "generatedAt": int(time.time() * 1000),
+        "fetchedAt": raw.get("fetchedAt") or 0,
+        "authors": authors,
+        "authorText": texts,
+        "nameTerms": nt, "namePostings": npost,
+        "nameGrams": {g: delta_encode(sorted(d)) for g, d in sorted(grams.items())},
+        "titleTerms": tt, "titlePostings": tpost,
+        "stopWords": sorted(STOP_WORDS),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the prefix/trigram search index for names and titles")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/search_index.json)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    idx = build(load_dataset(args.data))
+    write_json(args.out, idx)
+    postings = sum(map(len, idx["namePostings"])) + sum(map(len, idx["titlePostings"])) \
+        + sum(map(len, idx["nameGrams"].values()))
+    print(f"Wrote {args.out}: {len(idx['authors'])} authors, {len(idx['nameTerms'])} name terms, "
+          f"{len(idx['nameGrams'])} trigrams, {len(idx['titleTerms'])} title terms, "
+          f"{postings} postings in {time.time() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
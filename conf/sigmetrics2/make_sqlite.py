@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+make_sqlite.py - export data/sigmetrics.json and the overlays into a SQLite database
+(data/sigmetrics.sqlite) for ad-hoc analysis; query_sigmetrics.py runs named queries on it.
+
+Tables (one row per ...):
+  meta            dataset field (fetchedAt, startYear, endYear, source)
+  records         paper; id = its index in sigmetrics.json, team_size = number of authors
+  authors         author, with the fetcher's aggregates (pubs, first/last/solo, ...)
+  author_names    (author, name variant): canonical name and aliases, with norm_name
+  authorships     (record, position): author_id, 0-based position, team_size, year
+  coauthor_edges  (a, b, year) with a < b: joint papers that year; the view `coauthors`
+                  lists both directions
+  honors          overlay entry matched to an author exactly like the dashboard / author
+                  shards (kind = award | chair | officer | pc)
+  paper_awards    best-paper / test-of-time award matched to a record by normalized title,
+                  or by near-identical title via data/title_matches.json when present
+  awards, chairs, officers, pc_members, submissions
+                  the overlay files as published, people by name (norm_name for joins)
+
+Every foreign key and the (author, year) / (year) access paths are indexed. The file is
+rebuilt from scratch each run and replaced atomically. Overlays that are missing leave their
+tables empty.
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+from author_detail import build as build_detail
+from dataset import DEFAULT_DATA, load_papers, read_optional
+from snapshot import load_dataset
+from normalize import norm_name, norm_text
+
+DEFAULT_OUT = os.path.join("data", "sigmetrics.sqlite")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE records (
+  id INTEGER PRIMARY KEY, key TEXT, year INTEGER NOT NULL, title TEXT NOT NULL, norm_title TEXT,
+  venue TEXT, pages TEXT, doi TEXT, url TEXT, type TEXT, team_size INTEGER NOT NULL);
+CREATE TABLE authors (
+  id TEXT PRIMARY KEY, pid TEXT, name TEXT NOT NULL, pubs INTEGER, first_auth INTEGER,
+  last_auth INTEGER, solo INTEGER, coauthors INTEGER, avg_team REAL, active_years INTEGER,
+  first_year INTEGER, last_year INTEGER);
+CREATE TABLE author_names (
+  author_id TEXT NOT NULL REFERENCES authors(id), name TEXT NOT NULL, norm_name TEXT NOT NULL,
+  canonical INTEGER NOT NULL, PRIMARY KEY (author_id, name));
+CREATE TABLE authorships (
+  record_id INTEGER NOT NULL REFERENCES records(id), author_id TEXT NOT NULL REFERENCES authors(id),
+  position INTEGER NOT NULL, team_size INTEGER NOT NULL, year INTEGER NOT NULL,
+  PRIMARY KEY (record_id, position));
+CREATE TABLE coauthor_edges (
+  a TEXT NOT NULL REFERENCES authors(id), b TEXT NOT NULL REFERENCES authors(id),
+  year INTEGER NOT NULL, papers INTEGER NOT NULL, PRIMARY KEY (a, b, year));
+CREATE VIEW coauthors AS
+  SELECT a AS author_id, b AS coauthor_id, year, papers FROM coauthor_edges
+  UNION ALL SELECT b, a, year, papers FROM coauthor_edges;
+CREATE TABLE honors (
+  author_id TEXT NOT NULL REFERENCES authors(id), kind TEXT NOT NULL, year INTEGER,
+  role TEXT, term TEXT);
+CREATE TABLE paper_awards (
+  record_id INTEGER NOT NULL REFERENCES records(id), kind TEXT NOT NULL, award_year INTEGER);
+CREATE TABLE awards (
+  kind TEXT NOT NULL, year INTEGER, name TEXT NOT NULL, norm_name TEXT NOT NULL,
+  title TEXT, paper_year INTEGER, institution TEXT, advisor TEXT, outcome TEXT);
+CREATE TABLE chairs (
+  year INTEGER NOT NULL, role TEXT NOT NULL, name TEXT NOT NULL, norm_name TEXT NOT NULL, location TEXT);
+CREATE TABLE officers (
+  term TEXT NOT NULL, current INTEGER NOT NULL, role TEXT NOT NULL, name TEXT NOT NULL,
+  norm_name TEXT NOT NULL);
+CREATE TABLE pc_members (year INTEGER NOT NULL, name TEXT NOT NULL, norm_name TEXT NOT NULL);
+CREATE TABLE submissions (
+  year INTEGER PRIMARY KEY, submitted INTEGER, accepted INTEGER, rejected INTEGER, rate REAL, source TEXT);
+
+CREATE UNIQUE INDEX records_key ON records(key) WHERE key <> '';
+CREATE INDEX records_year ON records(year);
+CREATE INDEX records_norm_title ON records(norm_title);
+CREATE INDEX authors_name ON authors(name);
+CREATE INDEX author_names_norm ON author_names(norm_name);
+CREATE INDEX authorships_author_year ON authorships(author_id, year);
+CREATE INDEX authorships_year ON authorships(year);
+CREATE INDEX coauthor_edges_b ON coauthor_edges(b, year);
+CREATE INDEX coauthor_edges_year ON coauthor_edges(year);
+CREATE INDEX honors_author ON honors(author_id, kind);
+CREATE INDEX honors_kind_year ON honors(kind, year);
+CREATE INDEX paper_awards_record ON paper_awards(record_id);
+CREATE INDEX awards_norm ON awards(norm_name);
+CREATE INDEX chairs_norm ON chairs(norm_name);
+CREATE INDEX officers_norm ON officers(norm_name);
+CREATE INDEX pc_members_norm ON pc_members(norm_name);
+CREATE INDEX pc_members_year ON pc_members(year);
+"""
+
+
+def _people_rows(data_dir):
+    """Overlay tables as published: {table: [row tuple]}."""
+    rows = {"awards": [], "chairs": [], "officers": [], "pc_members": [], "submissions": []}
+    aw = read_optional(os.path.join(data_dir, "awards.json")) or {}
+    for kind, key in (("achievement", "achievement"), ("rising", "risingStar")):
+        for a in aw.get(key) or []:
+            rows["awards"].append((kind, a.get("year"), a["name"], norm_name(a["name"]),
+                                   None, None, None, None, None))
+    for a in aw.get("doctoral") or []:
+        rows["awards"].append(("doctoral", a.get("year"), a["name"], norm_name(a["name"]), a.get("title"),
+                               None, a.get("institution"), a.get("advisor"), a.get("kind")))
+    for a in aw.get("testOfTime") or []:
+        for n in a.get("authors") or []:
+            rows["awards"].append(("testOfTime", a.get("awardYear"), n, norm_name(n), a.get("title"),
+                                   a.get("paperYear"), None, None, None))
+    for a in aw.get("bestPaper") or []:
+        for n in a.get("authors") or []:
+            rows["awards"].append(("bestPaper", a.get("year"), n, norm_name(n), a.get("title"),
+                                   a.get("year"), None, None, a.get("type")))
+    for c in (read_optional(os.path.join(data_dir, "chairs.json")) or {}).get("conferences") or []:
+        for role in ("general", "program"):
+            for n in c.get(role) or []:
+                rows["chairs"].append((c.get("year"), role, n, norm_name(n), c.get("location")))
+    for t in (read_optional(os.path.join(data_dir, "officers.json")) or {}).get("terms") or []:
+        for r in t.get("roles") or []:
+            for n in r.get("people") or []:
+                rows["officers"].append((t.get("term"), int(bool(t.get("current"))), r.get("role"), n, norm_name(n)))
+    for y in (read_optional(os.path.join(data_dir, "pc.json")) or {}).get("years") or []:
+        for n in y.get("members") or []:
+            rows["pc_members"].append((y.get("year"), n, norm_name(n)))
+    for y in (read_optional(os.path.join(data_dir, "submissions.json")) or {}).get("years") or []:
+        rows["submissions"].append((y.get("year"), y.get("submitted"), y.get("accepted"),
+                                    y.get("rejected"), y.get("rate"), y.get("source")))
+    return rows, aw
+
+
+def build(raw, data_dir, path):
+    """Write the database to `path` (via a temp file). Returns {table: row count}."""
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = sqlite3.connect(tmp)
+    try:
+        con.executescript(SCHEMA)
+        con.executemany("INSERT INTO meta VALUES (?, ?)",
+                        [(k, raw.get(k)) for k in ("fetchedAt", "startYear", "endYear", "source")])
+
+        recs = raw.get("records") or []
+        con.executemany("INSERT INTO records VALUES (?,?,?,?,?,?,?,?,?,?,?)", [
+            (i, r.get("key") or "", int(r["year"]), r.get("title") or "",
+             r.get("normTitle") or norm_text(r.get("title")), r.get("venue"), r.get("pages"),
+             r.get("doi"), r.get("url"), r.get("type"), len(r.get("authors") or []))
+            for i, r in enumerate(recs)])
+
+        meta = raw.get("authorMeta") or {}
+        con.executemany("INSERT INTO authors VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", [
+            (a["id"], a.get("pid"), a.get("name") or a["id"], a.get("pubs"), a.get("firstAuth"),
+             a.get("lastAuth"), a.get("solo"), a.get("coauthors"), a.get("avgTeam"),
+             a.get("activeYears"), a.get("firstYear"), a.get("lastYear"))
+            for a in raw.get("authors") or []])
+        known = {a["id"] for a in raw.get("authors") or []}
+        names = []
+        for aid in known:
+            m = meta.get(aid) or {}
+            canonical = m.get("canonicalName") or m.get("name") or aid
+            for n in dict.fromkeys([canonical, *(m.get("aliases") or [])]):
+                names.append((aid, n, norm_name(n), int(n == canonical)))
+        con.executemany("INSERT INTO author_names VALUES (?,?,?,?)", names)
+
+        ships, edges = [], {}
+        for p in load_papers(raw):
+            ids, y = p["ids"], p["year"]
+            for pos, aid in enumerate(ids):
+                ships.append((p["index"], aid, pos, len(ids), y))
+            for a in set(ids):
+                for b in set(ids):
+                    if a < b:
+                        edges[(a, b, y)] = edges.get((a, b, y), 0) + 1
+        con.executemany("INSERT INTO authorships VALUES (?,?,?,?,?)", ships)
+        con.executemany("INSERT INTO coauthor_edges VALUES (?,?,?,?)",
+                        [(a, b, y, n) for (a, b, y), n in edges.items()])
+
+        honors = []
+        for aid, d in build_detail(raw, data_dir).items():
+            h = d.get("honors") or {}
+            honors += [(aid, "award", e["year"], e["type"], None) for e in h.get("awards", ())]
+            honors += [(aid, "chair", e["year"], e["role"], None) for e in h.get("chairs", ())]
+            honors += [(aid, "officer", None, e["role"], e["term"]) for e in h.get("officers", ())]
+            honors += [(aid, "pc", y, None, None) for y in h.get("pc", ())]
+        con.executemany("INSERT INTO honors VALUES (?,?,?,?,?)", honors)
+
+        overlay, aw = _people_rows(data_dir)
+        for table, rows in overlay.items():
+            if rows:
+                marks = ",".join("?" * len(rows[0]))
+                con.executemany(f"INSERT INTO {table} VALUES ({marks})", rows)
+        by_title = {}
+        for i, r in enumerate(recs):
+            by_title.setdefault(r.get("normTitle") or norm_text(r.get("title")), i)
+        tm = read_optional(os.path.join(data_dir, "title_matches.json")) or {}
+        if (tm.get("fetchedAt") or 0) == (raw.get("fetchedAt") or 0):   # near-identical award titles
+            by_key = {r.get("key"): i for i, r in enumerate(recs)}
+            for nt, m in (tm.get("awards") or {}).items():
+                if m.get("key") in by_key:
+                    by_title.setdefault(nt, by_key[m["key"]])
+        paper = [(by_title[norm_text(a.get("title"))], "testOfTime", a.get("awardYear"))
+                 for a in aw.get("testOfTime") or [] if norm_text(a.get("title")) in by_title]
+        paper += [(by_title[norm_text(a.get("title"))], a.get("type") or "best", a.get("year"))
+                  for a in aw.get("bestPaper") or [] if norm_text(a.get("title")) in by_title]
+        con.executemany("INSERT INTO paper_awards VALUES (?,?,?)", paper)
+
+        con.commit()
+        counts = {t: con.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in
+                  ("records", "authors", "authorships", "coauthor_edges", "honors", "paper_awards")}
+        con.execute("ANALYZE")
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export the dataset and overlays to SQLite")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/sigmetrics.sqlite)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    counts = build(load_dataset(args.data), os.path.dirname(args.data) or ".", args.out)
+    print(f"Wrote {args.out}: " + ", ".join(f"{n} {t}" for t, n in counts.items())
+          + f" in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+make_title_matches.py - match titles that are nearly, not exactly, the same, so the browser
+never has to (data/title_matches.json). The dashboard links award papers to records by
+exact normTitle. That misses award titles transcribed with a typo, other punctuation or
+a dropped subtitle, and it cannot tell that two records are one paper under two titles
+(a conference abstract and its journal version, say).
+
+  1. Shingles: each normalized title becomes the set of its words and adjacent word pairs.
+  2. MinHash: PERMS hash functions (a*x + b) mod 2^31-1 over the CRC-32 of each shingle;
+     the signature keeps each function's minimum. Two signatures agree in a position with
+     probability equal to the Jaccard similarity of the shingle sets.
+  3. LSH: the signature is cut into BANDS bands of ROWS values. Titles with one identical
+     band become candidates, so only colliding pairs are compared and the work stays close
+     to linear in the number of titles. Pairs at Jaccard 0.5 collide with probability
+     ~0.99, pairs at 0.1 with ~0.04.
+  4. Verification: each candidate pair gets its exact shingle similarity.
+
+Award titles (awards.json bestPaper and testOfTime) resolve to the best record scoring at
+least AWARD_MIN. The score is the Jaccard similarity, or the containment of the shorter
+title when it has at least CONTAIN_WORDS words (a dropped subtitle). The record's year
+must be within YEAR_SLACK of the paper year. Pairs of records at or above DUP_MIN Jaccard
+are listed as likely duplicates:
+
+  {format, fetchedAt, params,
+   awards: {normTitle of the award title: {key, title, year, score, exact}},
+   unmatched: [award titles with no record],
+   duplicates: [{keys: [a, b], years, titles, score}],        best first
+   stats: {records, awardTitles, exact, fuzzy, unmatched, candidates, duplicates, engine}}
+
+NumPy, when installed, computes the signatures; the output is the same either way.
+
+  python3 make_title_matches.py [--data data/sigmetrics.json]
+"""
+import argparse
+import os
+import random
+import time
+import zlib
+
+from dataset import DEFAULT_DATA, read_json, write_json
+from normalize import norm_text
+from snapshot import load_dataset
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORMAT = "sigmetrics-title-matches/1"
+DEFAULT_OUT = os.path.join("data", "title_matches.json")
+PERMS, BANDS, ROWS = 120, 40, 3
+PRIME = (1 << 31) - 1
+SEED = 1974
+AWARD_MIN = 0.6
+DUP_MIN = 0.7
+CONTAIN_WORDS = 5
+YEAR_SLACK = 2
+
+_rng = random.Random(SEED)
+_A = [_rng.randrange(1, PRIME) for _ in range(PERMS)]
+_B = [_rng.randrange(0, PRIME) for _ in range(PERMS)]
+
+
+def shingles(nt):
+    """Words and adjacent word pairs of a normalized title."""
+    w = nt.split()
+    return frozenset(w + [a + " " + b for a, b in zip(w, w[1:])])
+
+
+def _hashes(sh):
+    return [zlib.crc32(s.encode("utf-8")) % PRIME for s in sorted(sh)]
+
+
+def signatures(sets):
+    """One PERMS-long MinHash signature (a tuple) per shingle set."""
+    if np is not None:
+        A = np.array(_A, dtype=np.uint64)[:, None]
+        B = np.array(_B, dtype=np.uint64)[:, None]
+        out = []
+        for sh in sets:
+            x = np.array(_hashes(sh) or [0], dtype=np.uint64)[None, :]
+            out.append(tuple(((A * x + B) % PRIME).min(axis=1).tolist()))
+        return out
+    out = []
+    for sh in sets:
+        xs = _hashes(sh) or [0]
+        out.append(tuple(min((a * x + b) % PRIME for x in xs) for a, b in zip(_A, _B)))
+    return out
+
+
+def lsh_candidates(sigs):
+    """Index pairs (i < j) whose signatures share at least one band."""
+    pairs = set()
+    for band in range(BANDS):
+        lo = band * ROWS
+        buckets = {}
+        for i, s in enumerate(sigs):
+            buckets.setdefault(s[lo:lo + ROWS], []).append(i)
+        for ids in buckets.values():
+            for k, i in enumerate(ids):
+                for j in ids[k + 1:]:
+                    pairs.add((i, j))
+    return pairs
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def award_score(a, b, words):
+    """Jaccard, or containment of the shorter title when it has CONTAIN_WORDS words or more."""
+    j = jaccard(a, b)
+    if words >= CONTAIN_WORDS and a and b:
+        j = max(j, len(a & b) / min(len(a), len(b)))
+    return j
+
+
+def award_titles(awards):
+    """[(title, paper year or None)] for the paper awards, deduplicated by normTitle."""
+    out, seen = [], set()
+    for p in awards.get("bestPaper") or []:
+        out.append((p.get("title") or "", p.get("year")))
+    for p in awards.get("testOfTime") or []:
+        out.append((p.get("title") or "", p.get("paperYear")))
+    uniq = []
+    for t, y in out:
+        nt = norm_text(t)
+        if nt and nt not in seen:
+            seen.add(nt)
+            uniq.append((t, y))
+    return uniq
+
+
+def build(raw, awards=None):
+    recs = [r for r in raw.get("records") or [] if r.get("title")]
+    titles = [(r.get("title") or "").rstrip(".") for r in recs]
+    nts = [r.get("normTitle") or norm_text(t) for r, t in zip(recs, titles)]
+    aw = award_titles(awards or {})
+    n = len(recs)
+    sets = [shingles(nt) for nt in nts] + [shingles(norm_text(t)) for t, _ in aw]
+    pairs = lsh_candidates(signatures(sets))
+
+    exact = {}
+    for i, nt in enumerate(nts):
+        exact.setdefault(nt, i)
+    best = {}                                            # award index -> (score, -year gap, record index)
+    dups = []
+    for i, j in pairs:
+        if j < n:                                        # record / record
+            s = jaccard(sets[i], sets[j])
+            if s >= DUP_MIN and recs[i].get("key") != recs[j].get("key"):
+                dups.append((s, i, j))
+        elif i < n:                                      # record i / award j - n
+            k = j - n
+            year = aw[k][1]
+            ry = recs[i].get("year")
+            if year and ry and abs(int(ry) - int(year)) > YEAR_SLACK:
+                continue
+            words = min(len(nts[i].split()), len(norm_text(aw[k][0]).split()))
+            s = award_score(sets[i], sets[j], words)
+            gap = abs(int(ry) - int(year)) if year and ry else 0
+            if s >= AWARD_MIN and (s, -gap, -i) > best.get(k, (0, 0, 0)):
+                best[k] = (s, -gap, -i)
+
+    matched, unmatched = {}, []
+    for k, (t, year) in enumerate(aw):
+        nt = norm_text(t)
+        if nt in exact:
+            i, s, ex = exact[nt], 1.0, True
+        elif k in best:
+            i, s, ex = -best[k][2], best[k][0], False
+        else:
+            unmatched.append(t)
+            continue
+        r = recs[i]
+        matched[nt] = {"key": r.get("key") or "", "title": titles[i], "year": r.get("year"),
+                       "score": round(s, 3), "exact": ex}
+
+    dups.sort(key=lambda d: (-d[0], d[1], d[2]))
+    duplicates = [{"keys": [recs[i].get("key") or "", recs[j].get("key") or ""],
+                   "years": [recs[i].get("year"), recs[j].get("year")],
+                   "titles": [titles[i], titles[j]], "score": round(s, 3)} for s, i, j in dups]
+    return {
+        "format": FORMAT, "fetchedAt": raw.get("fetchedAt") or 0,
+        "params": {"perms": PERMS, "bands": BANDS, "rows": ROWS, "awardMin": AWARD_MIN, "dupMin": DUP_MIN,
+                   "containWords": CONTAIN_WORDS, "yearSlack": YEAR_SLACK},
+        "awards": matched, "unmatched": unmatched, "duplicates": duplicates,
+        "stats": {"records": n, "awardTitles": len(aw), "exact": sum(m["exact"] for m in matched.values()),
+                  "fuzzy": sum(not m["exact"] for m in matched.values()), "unmatched": len(unmatched),
+                  "candidates": len(pairs), "duplicates": len(duplicates),
+                  "engine": "numpy" if np is not None else "python"},
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Match award titles and near-duplicate records with MinHash/LSH")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/title_matches.json)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    data_dir = os.path.dirname(args.data) or "."
+    try:
+        awards = read_json(os.path.join(data_dir, "awards.json"))
+    except (OSError, ValueError):
+        awards = None
+    out = build(load_dataset(args.data), awards)
+    write_json(args.out, out, indent=1)
+    s = out["stats"]
+    print(f"Wrote {args.out}: {s['exact']} award titles exact, {s['fuzzy']} fuzzy, {s['unmatched']} unmatched; "
+          f"{s['duplicates']} likely duplicate records ({s['candidates']} LSH candidates, {s['engine']}) "
+          f"in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
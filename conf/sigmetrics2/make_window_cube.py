@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+make_window_cube.py - write data/window_cube.json: the scalar Overview and Network metrics
+for EVERY (from, to) year window the dashboard's year selector can pick (~1,400 windows for
+1974-2026), so changing the range is a table lookup instead of a recount + BFS.
+
+For each start year the builder sweeps the end year forward one year at a time, adding
+that year's papers to running counters: a pub-count histogram (for the Gini), a set of
+coauthor pairs, and a union-find over authors that have a coauthor (for the largest
+connected component). Total cost is one pass over the records per start year.
+
+Rows follow index.html's aggregateWindow() exactly (editorships and author-less records are
+skipped; "recent" = active in the window's last 5 years). Row for window (f, t) is
+    rows[i*n - i*(i-1)//2 + (j-i)]   with i = f-minYear, j = t-minYear, n = years.
+The file records the dataset's fetchedAt; the dashboard ignores a cube built from a
+different dataset.
+"""
+import argparse
+import time
+from collections import Counter
+
+from dataset import DEFAULT_DATA, write_json, load_papers, year_span, is_alphabetical
+from snapshot import load_dataset
+from unionfind import UnionFind
+
+DEFAULT_OUT = "data/window_cube.json"
+
+COLUMNS = ["papers", "authors", "recentAuthors", "multi", "alpha", "teamSum",
+           "gini", "links", "giant"]
+# links = sum over authors of distinct coauthors (= 2 x collaboration ties)
+
+
+def gini_from_hist(hist):
+    """Gini of a multiset given as {value: multiplicity} — same result as sorting the
+    values and applying index.html gini(), without materializing them."""
+    n = tot = s = 0
+    for v in sorted(hist):
+        m = hist[v]
+        if v <= 0 or m <= 0:
+            continue
+        # ranks n+1 .. n+m all hold value v
+        s += v * (m * n + m * (m + 1) // 2)
+        n += m
+        tot += v * m
+    if not n:
+        return 0.0
+    return (2 * s) / (n * tot) - (n + 1) / n
+
+
+def build(raw):
+    lo, hi = year_span(raw)
+    papers = [p for p in load_papers(raw) if lo <= p["year"] <= hi]
+    intern = {}
+    by_year = {y: [] for y in range(lo, hi + 1)}
+    year_authors = {y: set() for y in range(lo, hi + 1)}
+    for p in papers:
+        ids = [intern.setdefault(a, len(intern)) for a in p["ids"]]
+        by_year[p["year"]].append((ids, is_alphabetical(p["names"])))
+        year_authors[p["year"]].update(ids)
+
+    rows = []
+    for f in range(lo, hi + 1):
+        pubs, hist = {}, Counter()
+        pairs, links = set(), 0
+        uf = UnionFind()
+        n_papers = multi = alpha = team_sum = 0
+        for t in range(f, hi + 1):
+            for ids, alpha_order in by_year[t]:
+                n_papers += 1
+                team_sum += len(ids)
+                if len(ids) > 1:
+                    multi += 1
+                    alpha += alpha_order
+                for a in ids:
+                    c = pubs.get(a, 0)
+                    if c:
+                        hist[c] -= 1
+                    pubs[a] = c + 1
+                    hist[c + 1] += 1
+                for i in range(len(ids)):
+                    for j in range(i + 1, len(ids)):
+                        a, b = ids[i], ids[j]
+                        k = (a, b) if a <= b else (b, a)
+                        if k not in pairs:
+                            pairs.add(k)
+                            links += 1 if a == b else 2
+                        if a == b:
+                            uf.add(a)
+                        else:
+                            uf.union(a, b)
+            recent = set().union(*(year_authors[y] for y in range(max(f, t - 4), t + 1)))
+            rows.append([n_papers, len(pubs), len(recent), multi, alpha, team_sum,
+                         round(gini_from_hist(hist), 6), links, uf.largest])
+
+    return {
+        "generatedAt": int(time.time() * 1000),
+        "fetchedAt": raw.get("fetchedAt") or 0,
+        "minYear": lo, "maxYear": hi,
+        "columns": COLUMNS,
+        "rows": rows,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Precompute Overview/Network metrics for every year window")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--out", default=DEFAULT_OUT, help="Output path (default: data/window_cube.json)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    cube = build(load_dataset(args.data))
+    write_json(args.out, cube)
+    print(f"Wrote {args.out}: {len(cube['rows'])} windows "
+          f"({cube['minYear']}-{cube['maxYear']}) in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+normalize.py - the one set of name/title normalization rules shared by the Python builders
+and mirrored by index.html, so a key computed offline equals the one the browser would
+compute:
+
+  norm_text(s)      normTitle: lowercase, NFKD, strip combining accents, collapse every run
+                    of non [a-z0-9] characters to one space, trim
+  norm_name(s)      normName: norm_text of the name without dblp's " 0001" suffix
+  fuzzy_key(nn)     fuzzyKeyNorm: "surname|first initial" of a normalized name
+  pc_key(name)      PC roster key: norm_name without parenthetical nicknames ("(Kevin)")
+
+Regexes are compiled once and results are memoized, since the same names and titles come
+up thousands of times in one build.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+_DBLP_SUFFIX = re.compile(r"\s+\d{4}$")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_PARENS = re.compile(r"\(.*?\)")
+
+
+def clean_name(n):
+    return _DBLP_SUFFIX.sub("", n or "")
+
+
+@lru_cache(maxsize=None)
+def norm_text(s):
+    s = unicodedata.normalize("NFKD", (s or "").lower())
+    s = "".join(c for c in s if not 0x300 <= ord(c) <= 0x36F)
+    return _NON_ALNUM.sub(" ", s).strip()
+
+
+norm_title = norm_text
+
+
+@lru_cache(maxsize=None)
+def norm_name(n):
+    return norm_text(clean_name(n))
+
+
+def first_last(nn):
+    """(first, last) tokens of a normalized name (index.html firstLastNorm)."""
+    p = nn.split()
+    return (p[0] if p else ""), (p[-1] if p else "")
+
+
+def fuzzy_key(nn):
+    """Surname + first initial of a normalized name (index.html fuzzyKeyNorm)."""
+    first, last = first_last(nn)
+    return last + "|" + first[:1]
+
+
+def first_compatible(a, b):
+    """Could two normalized first-name tokens be the same person (initial vs full name,
+    Don vs Donald)? Mirrors index.html firstCompatible."""
+    if not a or not b:
+        return True
+    if len(a) == 1 or len(b) == 1:
+        return a[0] == b[0]
+    return a == b or a.startswith(b) or b.startswith(a)
+
+
+def pc_key(name):
+    return norm_name(_PARENS.sub(" ", name or ""))
+
+
+def name_keys(names):
+    """(normNames, fuzzyKeys) for a list of name variants: distinct non-empty normalized
+    names in first-seen order, and the fuzzy key of each."""
+    keys = list(dict.fromkeys(k for k in map(norm_name, names) if k))
+    return keys, [fuzzy_key(k) for k in keys]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+query_sigmetrics.py - run named, parameterized queries (or raw SQL) against the database
+make_sqlite.py writes, without loading any JSON.
+
+  python3 query_sigmetrics.py                                   # list the named queries
+  python3 query_sigmetrics.py pc-and-papers min_papers=5 from=2015 to=2020
+  python3 query_sigmetrics.py coauthors name="Erol Gelenbe" --format csv
+  python3 query_sigmetrics.py --sql "SELECT year, COUNT(*) FROM records GROUP BY year"
+
+Parameters are key=value pairs bound as :key; numeric values are passed as numbers. Each
+named query documents its parameters and their defaults.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from make_sqlite import DEFAULT_OUT
+from normalize import norm_name
+
+# name -> (description, {param: default}, SQL). Year windows are inclusive.
+QUERIES = {
+    "top-authors": (
+        "Most papers in a year window",
+        {"from": 1974, "to": 9999, "limit": 20},
+        """SELECT a.name, COUNT(*) AS papers, SUM(s.position = 0) AS first_author
+             FROM authorships s JOIN authors a ON a.id = s.author_id
+            WHERE s.year BETWEEN :from AND :to
+            GROUP BY s.author_id ORDER BY papers DESC, a.name LIMIT :limit"""),
+    "pc-and-papers": (
+        "Authors with at least min_papers papers and PC service in the window",
+        {"from": 2015, "to": 2020, "min_papers": 5},
+        """SELECT a.name, p.papers, GROUP_CONCAT(DISTINCT h.year) AS pc_years
+             FROM (SELECT author_id, COUNT(*) AS papers FROM authorships
+                    WHERE year BETWEEN :from AND :to GROUP BY author_id
+                   HAVING COUNT(*) >= :min_papers) p
+             JOIN honors h ON h.author_id = p.author_id AND h.kind = 'pc'
+                          AND h.year BETWEEN :from AND :to
+             JOIN authors a ON a.id = p.author_id
+            GROUP BY p.author_id ORDER BY p.papers DESC, a.name"""),
+    "honored-authors": (
+        "Authors holding an honor of `kind` (award, chair, officer, pc), with their paper counts",
+        {"kind": "award"},
+        """SELECT a.name, GROUP_CONCAT(DISTINCT COALESCE(h.role, '') || ' ' || COALESCE(h.year, h.term, '')) AS honors,
+                  a.pubs, a.first_year, a.last_year
+             FROM honors h JOIN authors a ON a.id = h.author_id
+            WHERE h.kind = :kind GROUP BY h.author_id ORDER BY a.pubs DESC, a.name"""),
+    "coauthors": (
+        "Coauthors of the author named `name` (any alias) in a year window",
+        {"name": None, "from": 1974, "to": 9999, "limit": 50},
+        """SELECT c.name AS coauthor, SUM(e.papers) AS joint_papers, MIN(e.year) AS first, MAX(e.year) AS last
+             FROM coauthors e JOIN authors c ON c.id = e.coauthor_id
+            WHERE e.author_id IN (SELECT author_id FROM author_names WHERE norm_name = :norm_name)
+              AND e.year BETWEEN :from AND :to
+            GROUP BY e.coauthor_id ORDER BY joint_papers DESC, coauthor LIMIT :limit"""),
+    "author-papers": (
+        "Papers of the author named `name` (any alias), newest first",
+        {"name": None},
+        """SELECT r.year, r.title, s.position + 1 AS position, s.team_size
+             FROM authorships s JOIN records r ON r.id = s.record_id
+            WHERE s.author_id IN (SELECT author_id FROM author_names WHERE norm_name = :norm_name)
+            ORDER BY r.year DESC, r.key"""),
+    "newcomers": (
+        "Authors whose first SIGMETRICS paper appeared in `year`, by later output",
+        {"year": 2015},
+        """SELECT name, pubs, last_year FROM authors WHERE first_year = :year
+            ORDER BY pubs DESC, name"""),
+    "strongest-pairs": (
+        "Coauthor pairs with the most joint papers in a year window",
+        {"from": 1974, "to": 9999, "limit": 20},
+        """SELECT x.name AS author, y.name AS coauthor, SUM(e.papers) AS joint_papers
+             FROM coauthor_edges e JOIN authors x ON x.id = e.a JOIN authors y ON y.id = e.b
+            WHERE e.year BETWEEN :from AND :to
+            GROUP BY e.a, e.b ORDER BY joint_papers DESC, author LIMIT :limit"""),
+    "team-size": (
+        "Papers and mean team size per year",
+        {"from": 1974, "to": 9999},
+        """SELECT year, COUNT(*) AS papers, ROUND(AVG(team_size), 2) AS mean_team
+             FROM records WHERE year BETWEEN :from AND :to GROUP BY year ORDER BY year"""),
+    "award-papers": (
+        "Best-paper and test-of-time awards matched to dataset records",
+        {},
+        """SELECT w.award_year, w.kind, r.year AS paper_year, r.title
+             FROM paper_awards w JOIN records r ON r.id = w.record_id
+            ORDER BY w.award_year DESC, w.kind"""),
+}
+
+
+def _value(v):
+    for cast in (int, float):
+        try:
+            return cast(v)
+        except ValueError:
+            pass
+    return v
+
+
+def parse_params(pairs):
+    out = {}
+    for p in pairs:
+        if "=" not in p:
+            raise SystemExit(f"parameter {p!r} is not key=value")
+        k, v = p.split("=", 1)
+        out[k] = _value(v)
+    return out
+
+
+def run(con, sql, params):
+    cur = con.execute(sql, params)
+    return [d[0] for d in cur.description or ()], cur.fetchall()
+
+
+def named(name, params):
+    """(sql, bound params) for a named query: defaults filled in, `name` normalized."""
+    if name not in QUERIES:
+        raise SystemExit(f"unknown query {name!r}; run without arguments for the list")
+    _, defaults, sql = QUERIES[name]
+    bound = {**defaults, **params}
+    missing = [k for k, v in bound.items() if v is None]
+    if missing:
+        raise SystemExit(f"{name} needs " + ", ".join(f"{k}=..." for k in missing))
+    if "name" in bound:
+        bound["norm_name"] = norm_name(str(bound["name"]))
+    return sql, bound
+
+
+def show(cols, rows, fmt, out=sys.stdout):
+    if fmt == "csv":
+        w = csv.writer(out)
+        w.writerow(cols)
+        w.writerows(rows)
+    elif fmt == "json":
+        json.dump([dict(zip(cols, r)) for r in rows], out, ensure_ascii=False, indent=1)
+        out.write("\n")
+    else:
+        cells = [cols] + [["" if v is None else str(v) for v in r] for r in rows]
+        widths = [max(len(c[i]) for c in cells) for i in range(len(cols))]
+        for n, c in enumerate(cells):
+            out.write("  ".join(v.ljust(w) for v, w in zip(c, widths)).rstrip() + "\n")
+            if n == 0:
+                out.write("  ".join("-" * w for w in widths) + "\n")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Query data/sigmetrics.sqlite (run make_sqlite.py first)")
+    ap.add_argument("query", nargs="?", help="Named query (omit to list them)")
+    ap.add_argument("params", nargs="*", help="key=value parameters")
+    ap.add_argument("--sql", help="Run this SQL instead of a named query (parameters bind as :key)")
+    ap.add_argument("--db", default=DEFAULT_OUT, help="Database path (default: data/sigmetrics.sqlite)")
+    ap.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    args = ap.parse_args()
+
+    if not args.query and not args.sql:
+        for name, (desc, defaults, _) in QUERIES.items():
+            ps = " ".join(f"{k}={'…' if v is None else v}" for k, v in defaults.items())
+            print(f"{name:16} {desc}\n{'':16} {ps}")
+        return
+    if not os.path.exists(args.db):
+        raise SystemExit(f"{args.db} not found; run python3 make_sqlite.py first")
+    if args.sql:
+        sql, params = args.sql, parse_params(([args.query] if args.query else []) + args.params)
+    else:
+        sql, params = named(args.query, parse_params(args.params))
+
+    con = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    t0 = time.perf_counter()
+    cols, rows = run(con, sql, params)
+    ms = (time.perf_counter() - t0) * 1000
+    show(cols, rows, args.format)
+    if args.format == "table":
+        print(f"({len(rows)} rows, {ms:.1f} ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+serve_sigmetrics.py - a small threaded HTTP server that loads data/sigmetrics.json once,
+answers the dashboard's window queries itself, and serves the site's static files, so the
+browser never has to download or aggregate the full record list.
+
+  python3 serve_sigmetrics.py            # then open http://localhost:8001/?api
+  index.html?api=http://host:8001        # a dashboard served elsewhere (CORS is allowed)
+
+Endpoints (JSON; from/to are an inclusive year window, clamped like setRange):
+
+  /api/meta                                dataset header, authorMeta, totals, quality counts
+  /api/overview?from&to                    index.html aggregateWindow() comm, plus
+                                           recentAuthors, meanCoauthors, topConnected
+  /api/authors?from&to&sort&dir&min&q&offset&limit
+                                           one page of the Authors table ({total, rows,
+                                           papers}); q matches any name variant, and with 3+
+                                           characters also paper titles
+  /api/author?id&from&to                   author page: window row, papers, coauthors by
+                                           year, honors, links, and the ego network
+
+Rows use the field names of index.html ingestWindow. Everything is computed from the
+in-memory indexes window_index.Index builds at startup (year-sorted papers, per-author
+postings, the author_detail detail), and each response body is kept in an LRU keyed by (endpoint, window,
+params) and bounded by --cache-mb. Responses carry a strong ETag; a matching If-None-Match
+gets 304 Not Modified.
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from dataset import DEFAULT_DATA
+from snapshot import load_dataset
+from window_index import Index
+
+SORTS = ("name", "pubs", "recent", "activeYears", "firstYear", "lastYear", "coauthorCount", "avgTeam", "_rel")
+
+
+class LRU:
+    """(key) -> (etag, body bytes), least recently used first out once the bodies exceed
+    max_bytes. Safe to share between request threads."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes, self.bytes = max_bytes, 0
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            v = self.items.get(key)
+            if v is None:
+                self.misses += 1
+                return None
+            self.items.move_to_end(key)
+            self.hits += 1
+            return v
+
+    def put(self, key, value):
+        size = len(value[1])
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old:
+                self.bytes -= len(old[1])
+            self.items[key] = value
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, body) = self.items.popitem(last=False)
+                self.bytes -= len(body)
+
+
+def _int(qs, k, default):
+    try:
+        return int(qs[k][0])
+    except (KeyError, ValueError, IndexError):
+        return default
+
+
+class App:
+    def __init__(self, index, cache_bytes):
+        self.index, self.cache = index, LRU(cache_bytes)
+
+    def _rows(self, f, t):
+        """The window's author rows, shared by every endpoint and cached like a response
+        (sized at a rough 400 bytes per row)."""
+        key = ("rows", f, t)
+        hit = self.cache.get(key)
+        if hit is None:
+            rows = self.index.author_rows(f, t)
+            hit = (None, _Sized(rows, 400 * len(rows)))
+            self.cache.put(key, hit)
+        return hit[1].value
+
+    def respond(self, path, qs):
+        """(etag, body) for an API path, from the LRU when this exact query was answered."""
+        ix = self.index
+        f, t = ix.window(_int(qs, "from", ix.full_min), _int(qs, "to", ix.full_max))
+        if path == "/api/meta":
+            key, make = ("meta",), ix.header
+        elif path == "/api/overview":
+            key, make = ("overview", f, t), lambda: ix.overview(f, t, self._rows(f, t))
+        elif path == "/api/authors":
+            sort = (qs.get("sort") or ["pubs"])[0]
+            sort = sort if sort in SORTS else "pubs"
+            params = (sort, -1 if _int(qs, "dir", -1) < 0 else 1, max(1, _int(qs, "min", 1)),
+                      (qs.get("q") or [""])[0][:200], max(0, _int(qs, "offset", 0)),
+                      max(1, min(1000, _int(qs, "limit", 60))))
+            key, make = ("authors", f, t) + params, lambda: ix.authors(f, t, self._rows(f, t), *params)
+        elif path == "/api/author":
+            aid = (qs.get("id") or [""])[0]
+            key, make = ("author", f, t, aid), lambda: ix.author(aid, f, t, self._rows(f, t))
+        else:
+            return None
+        hit = self.cache.get(key)
+        if hit is None:
+            body = json.dumps({"fetchedAt": ix.fetched_at, "from": f, "to": t, **make()},
+                              ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            hit = ('"%s"' % hashlib.sha1(body).hexdigest(), body)
+            self.cache.put(key, hit)
+        return hit
+
+
+class _Sized:
+    """A cached Python value with an estimated size, so the LRU can bound it like a body."""
+
+    def __init__(self, value, size):
+        self.value, self.size = value, size
+
+    def __len__(self):
+        return self.size
+
+
+class Handler(SimpleHTTPRequestHandler):
+    app = None
+
+    def end_headers(self):
+        if self.path.startswith("/api/"):
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Expose-Headers", "ETag")
+        super().end_headers()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if not url.path.startswith("/api/"):
+            return super().do_GET()
+        try:
+            hit = self.app.respond(url.path, parse_qs(url.query))
+        except Exception as e:                                   # report, keep serving
+            self.send_error(500, str(e))
+            return
+        if hit is None:
+            self.send_error(404, "unknown endpoint")
+            return
+        etag, body = hit
+        if etag in (self.headers.get("If-None-Match") or ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(fmt, *args)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve the dashboard with server-side window queries")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    ap.add_argument("--host", default="127.0.0.1", help="Bind address (default 127.0.0.1)")
+    ap.add_argument("--port", type=int, default=8001, help="Port (default 8001)")
+    ap.add_argument("--cache-mb", type=float, default=64, help="Response cache bound in MB (default 64)")
+    ap.add_argument("--quiet", action="store_true", help="Do not log each request")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    index = Index(load_dataset(args.data), os.path.dirname(args.data) or ".")
+    Handler.app = App(index, int(args.cache_mb * 1024 * 1024))
+    site = os.path.dirname(os.path.abspath(__file__))
+    server = ThreadingHTTPServer((args.host, args.port), partial(Handler, directory=site))
+    server.quiet = args.quiet
+    print(f"Loaded {len(index.papers)} papers, {len(index.postings)} authors in {time.time() - t0:.1f}s")
+    print(f"Serving http://{args.host}:{args.port}/?api  (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
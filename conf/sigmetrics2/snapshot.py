@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+snapshot.py - a binary copy of data/sigmetrics.json (data/sigmetrics.snap) that Python tools
+open in milliseconds instead of re-parsing the JSON and rebuilding the same structures.
+
+File layout (little-endian):
+
+  b"SIGSNAP\\0"  u64 header offset
+  columns       pickle (protocol 5) of the record columns and author table; with NumPy the
+                arrays are out-of-band buffers, stored below and mapped, not copied, on load
+  raw           marshal of the dataset dict itself (quicker to read than pickle or JSON),
+                loaded only if .raw is used
+  buffers       the column arrays, each 64-byte aligned
+  header        JSON: {version, python, source: {sha256, size, mtimeNs}, fetchedAt, numpy,
+                       columns: [offset, length], raw: [offset, length], buffers: [[offset, length]]}
+
+load() rejects a snapshot (returns None) when its VERSION or Python (marshal is version
+specific) differs, when it was written with NumPy and NumPy is missing, or when the JSON it was made from changed: same size and mtime
+is trusted, anything else is re-hashed. load_dataset() falls back to the JSON then, so a
+stale snapshot costs one json.load, never wrong numbers. Like pickles, snapshots are only
+safe to open if you built them yourself.
+
+  snap = snapshot.load("data/sigmetrics.json")
+  snap.records["year"], snap.records["ptr"], snap.records["author"]   # CSR authorships
+  snap.authors["id"][code], snap.authors["pubs"][code], snap.code["pid:..."]
+  snap.raw                                                            # the full dict
+
+  python3 snapshot.py [--data data/sigmetrics.json]     # (re)write the snapshot
+"""
+import argparse
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import pickle
+import struct
+import sys
+import time
+from array import array
+
+from dataset import DEFAULT_DATA, read_json, record_authors
+
+try:
+    import numpy as np
+except ImportError:            # optional: columns fall back to array.array, pickled in-band
+    np = None
+
+VERSION = 1
+MAGIC = b"SIGSNAP\0"
+PYTHON = "%d.%d" % sys.version_info[:2]
+ALIGN = 64
+STATS = ("pubs", "firstAuth", "lastAuth", "solo", "coauthors", "activeYears", "firstYear", "lastYear")
+
+
+def snapshot_path(json_path):
+    return os.path.splitext(json_path)[0] + ".snap"
+
+
+def _source(json_path, digest=True):
+    st = os.stat(json_path)
+    out = {"size": st.st_size, "mtimeNs": st.st_mtime_ns}
+    if digest:
+        with open(json_path, "rb") as f:
+            out["sha256"] = hashlib.sha256(f.read()).hexdigest()
+    return out
+
+
+def _column(values, code):
+    """int column: a NumPy array (out-of-band when pickled) or an array.array."""
+    if np is not None:
+        return np.asarray(values, dtype={"i": np.int32, "q": np.int64, "d": np.float64}[code])
+    return array(code, values)
+
+
+def columns(raw):
+    """Record columns and the author table, indexed by author code (first-appearance order
+    over the records, then any author only in authorMeta / authors)."""
+    recs = raw.get("records") or []
+    code, ptr, author = {}, [0], []
+    for r in recs:
+        for aid, _, _ in record_authors(r):
+            author.append(code.setdefault(aid, len(code)))
+        ptr.append(len(author))
+    rows = {a["id"]: a for a in raw.get("authors") or []}
+    meta = raw.get("authorMeta") or {}
+    for aid in list(meta) + list(rows):
+        code.setdefault(aid, len(code))
+    ids = list(code)
+    table = {"id": ids,
+             "name": [(meta.get(a) or {}).get("canonicalName") or (rows.get(a) or {}).get("name") or a for a in ids],
+             "pid": [(meta.get(a) or {}).get("pid") or (rows.get(a) or {}).get("pid") for a in ids]}
+    for k in STATS:
+        table[k] = _column([(rows.get(a) or {}).get(k) or 0 for a in ids], "i")
+    table["avgTeam"] = _column([(rows.get(a) or {}).get("avgTeam") or 0.0 for a in ids], "d")
+    return {
+        "records": {"year": _column([int(r.get("year") or 0) for r in recs], "i"),
+                    "ptr": _column(ptr, "q"), "author": _column(author, "i"),
+                    "key": [r.get("key") or "" for r in recs], "title": [r.get("title") or "" for r in recs],
+                    "type": [r.get("type") or "" for r in recs]},
+        "authors": table,
+        "code": code,
+    }
+
+
+def write(raw, json_path, out=None):
+    """Write the snapshot of `raw`, which must be the dataset currently at json_path. It is
+    stored as json.load would return it (lists, not tuples), whatever built it."""
+    out = out or snapshot_path(json_path)
+    raw = json.loads(json.dumps(raw, ensure_ascii=False))
+    bufs = []
+    cols = pickle.dumps(columns(raw), protocol=5, buffer_callback=bufs.append)
+    whole = marshal.dumps(raw)
+    tmp = out + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", 0))
+        sections = {}
+        for name, blob in (("columns", cols), ("raw", whole)):
+            sections[name] = [f.tell(), len(blob)]
+            f.write(blob)
+        spans = []
+        for b in bufs:
+            view = b.raw()
+            f.write(b"\0" * (-f.tell() % ALIGN))
+            spans.append([f.tell(), view.nbytes])
+            f.write(view)
+        header_at = f.tell()
+        f.write(json.dumps({"version": VERSION, "python": PYTHON, "source": _source(json_path), "fetchedAt": raw.get("fetchedAt") or 0,
+                            "numpy": np is not None, "buffers": spans, **sections}).encode("utf-8"))
+        f.seek(len(MAGIC))
+        f.write(struct.pack("<Q", header_at))
+    os.replace(tmp, out)
+    return out
+
+
+class Snapshot:
+    def __init__(self, mm, header, cols):
+        self._mm, self.header = mm, header
+        self.records, self.authors, self.code = cols["records"], cols["authors"], cols["code"]
+        self.fetched_at = header["fetchedAt"]
+        self._raw = None
+
+    @property
+    def raw(self):
+        if self._raw is None:
+            o, n = self.header["raw"]
+            self._raw = marshal.loads(memoryview(self._mm)[o:o + n])
+        return self._raw
+
+
+def load(json_path=DEFAULT_DATA, path=None):
+    """The snapshot for json_path, memory-mapped, or None if it is missing or unusable."""
+    path = path or snapshot_path(json_path)
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        if mm[:len(MAGIC)] != MAGIC:
+            return None
+        (header_at,) = struct.unpack("<Q", mm[len(MAGIC):len(MAGIC) + 8])
+        header = json.loads(mm[header_at:].decode("utf-8"))
+        if (header.get("version"), header.get("python")) != (VERSION, PYTHON) or (header.get("numpy") and np is None):
+            return None
+        src, now = header["source"], _source(json_path, digest=False)
+        if (src["size"], src["mtimeNs"]) != (now["size"], now["mtimeNs"]) \
+                and src["sha256"] != _source(json_path)["sha256"]:
+            return None                                        # the JSON changed since
+        view = memoryview(mm)
+        buffers = [view[o:o + n] for o, n in header["buffers"]]
+        o, n = header["columns"]
+        return Snapshot(mm, header, pickle.loads(view[o:o + n], buffers=buffers))
+    except (OSError, ValueError, KeyError, struct.error, pickle.UnpicklingError):
+        return None
+
+
+def load_dataset(json_path=DEFAULT_DATA):
+    """The dataset dict: from a current snapshot when there is one, else the JSON."""
+    snap = load(json_path)
+    return snap.raw if snap is not None else read_json(json_path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write the binary snapshot of sigmetrics.json for fast loading")
+    ap.add_argument("--data", default=DEFAULT_DATA, help="Path to sigmetrics.json (default: data/sigmetrics.json)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    path = write(read_json(args.data), args.data)
+    t1 = time.time()
+    snap = load(args.data)
+    t2 = time.time()
+    snap.raw
+    t3 = time.time()
+    print(f"Wrote {path}: {os.path.getsize(path)} bytes in {t1 - t0:.2f}s; "
+          f"columns load in {(t2 - t1) * 1000:.1f} ms, full dataset in {(t3 - t2) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+test_author_stats.py - the NumPy and pure-Python author aggregates must agree, and so must
+AuthorState's incremental updates and a full recompute.
+
+  python3 -m unittest test_author_stats        # from conf/sigmetrics2
+"""
+import random
+import unittest
+
+import author_stats
+from author_stats import AuthorState, author_columns, author_stats as rows
+
+
+def synthetic(n, seed, pool=None):
+    """Records in the fetch_sigmetrics.py schema, with the awkward cases mixed in: solo
+    papers, an id listed twice on one record, and records without authors."""
+    rnd = random.Random(seed)
+    ids = [f"pid:{k}" if k % 4 else f"name:Author {k}" for k in range(pool or max(4, n // 3))]
+    recs = []
+    for i in range(n):
+        team = rnd.sample(ids, max(1, min(12, int(rnd.expovariate(1 / 3.5)) + 1)))
+        if i % 97 == 0:
+            team.append(team[0])
+        if i % 131 == 0:
+            team = []
+        recs.append({"key": f"conf/sigmetrics/{i}", "year": 1974 + rnd.randrange(53),
+                     "authors": [{"id": a, "name": a} for a in team], "authorIds": team})
+    return recs
+
+
+@unittest.skipIf(author_stats.np is None, "NumPy not installed")
+class NumpyMatchesPython(unittest.TestCase):
+    def check(self, recs):
+        self.assertEqual(author_columns(recs, use_numpy=True), author_columns(recs, use_numpy=False))
+
+    def test_synthetic(self):
+        for n, seed in ((1, 1), (50, 2), (5000, 3)):
+            self.check(synthetic(n, seed))
+
+    def test_edge_cases(self):
+        self.check([])
+        self.check([{"year": 2000, "authorIds": []}])
+        self.check([{"year": 2000, "authorIds": ["a"]}])
+        self.check([{"year": 2000, "authorIds": ["a", "a"]}, {"year": 1999, "authorIds": ["b", "a"]}])
+
+    def test_rows(self):
+        recs = synthetic(500, 4)
+        self.assertEqual(rows(recs, use_numpy=True), rows(recs, use_numpy=False))
+
+
+class StateMatchesFullRecompute(unittest.TestCase):
+    def test_incremental(self):
+        recs = synthetic(3000, 5, pool=400)
+        state = AuthorState()
+        for part in (recs[:2000], recs, recs[500:], recs[:2500]):
+            state.update(part)
+            self.assertEqual(state.columns(part), author_columns(part, use_numpy=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
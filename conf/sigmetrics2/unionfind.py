@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+unionfind.py - disjoint-set forest with union by size and path halving, keyed by any
+hashable (author ids). Used by the network builders to grow connected components one
+record at a time instead of re-running a BFS over the whole coauthor graph.
+"""
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.components = 0
+        self.largest = 0
+        self.largest_root = None
+
+    def __contains__(self, x):
+        return x in self.parent
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, x):
+        """Make x a singleton set if it is new. Returns True when x was added."""
+        if x in self.parent:
+            return False
+        self.parent[x] = x
+        self.size[x] = 1
+        self.components += 1
+        if not self.largest:
+            self.largest, self.largest_root = 1, x
+        return True
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        """Merge the sets of a and b (adding either if new). Returns the new root, or
+        None if they were already connected."""
+        self.add(a)
+        self.add(b)
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return None
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size.pop(rb)
+        self.components -= 1
+        if self.size[ra] > self.largest:
+            self.largest, self.largest_root = self.size[ra], ra
+        return ra
+
+    def set_size(self, x):
+        return self.size[self.find(x)]
+
+    def groups(self):
+        """{root: [members]} for every set."""
+        out = {}
+        for x in self.parent:
+            out.setdefault(self.find(x), []).append(x)
+        return out
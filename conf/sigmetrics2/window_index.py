@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+window_index.py - the dataset loaded once and indexed for year-window queries: the Authors
+table rows (index.html ingestWindow), the Overview (aggregateWindow's comm), the author page
+and the dataset header. serve_sigmetrics.py answers its API from it; make_bootstrap.py
+computes the embedded Overview with it.
+"""
+import bisect
+
+from author_detail import build as build_detail
+from dataset import load_papers, record_authors, year_span, is_alphabetical, gini
+from normalize import clean_name, norm_name, norm_text
+from unionfind import UnionFind
+
+LORENZ_POINTS = 400
+
+
+class Index:
+    """The dataset, loaded once and indexed for window queries."""
+
+    def __init__(self, raw, data_dir):
+        self.raw = raw
+        self.fetched_at = raw.get("fetchedAt") or 0
+        self.full_min, self.full_max = year_span(raw)
+        self.meta = raw.get("authorMeta") or {}
+        papers = load_papers(raw)
+        for p in papers:
+            p["alpha"] = is_alphabetical(p["names"])
+            p["pids"] = [a[2] for a in record_authors(raw["records"][p["index"]])]
+        papers.sort(key=lambda p: p["year"])                     # stable: dataset order within a year
+        self.papers = papers
+        self.years = [p["year"] for p in papers]
+        self.postings = {}
+        for i, p in enumerate(papers):
+            for aid in dict.fromkeys(p["ids"]):
+                self.postings.setdefault(aid, []).append(i)
+        self.detail = build_detail(raw, data_dir)
+        self.names = {}
+        for aid in self.postings:
+            m = self.meta.get(aid) or {}
+            variants = [m.get("canonicalName"), m.get("name"), *(m.get("aliases") or [])]
+            self.names[aid] = list(dict.fromkeys(k for k in map(norm_name, filter(None, variants)) if k))
+
+    def window(self, f, t):
+        """Clamp and order a window like index.html setRange."""
+        f = max(self.full_min, min(f, self.full_max))
+        t = max(self.full_min, min(t, self.full_max))
+        return (f, t) if f <= t else (t, f)
+
+    def slice(self, f, t):
+        return self.papers[bisect.bisect_left(self.years, f):bisect.bisect_right(self.years, t)]
+
+    def author_rows(self, f, t):
+        """{id: row} for the window, field for field like ingestWindow."""
+        rows = {}
+        for p in self.slice(f, t):
+            ids, size = p["ids"], len(p["ids"])
+            for i, aid in enumerate(ids):
+                o = rows.get(aid)
+                if o is None:
+                    m = self.meta.get(aid) or {}
+                    aliases = m.get("aliases") or []
+                    o = rows[aid] = {
+                        "id": aid, "realPid": None,
+                        "name": clean_name(m.get("canonicalName") or m.get("name") or p["names"][i]),
+                        "aliases": len(aliases) or 1,
+                        "aliasNames": aliases or [m.get("canonicalName") or m.get("name") or p["names"][i]],
+                        "normNames": m.get("normNames"),
+                        "pubs": 0, "byYear": {}, "co": set(), "teamSum": 0,
+                        "first": 0, "last": 0, "solo": 0, "alpha": 0, "multi": 0}
+                if not o["realPid"] and i < len(p["pids"]) and p["pids"][i]:
+                    o["realPid"] = p["pids"][i]
+                o["pubs"] += 1
+                o["teamSum"] += size
+                o["byYear"][p["year"]] = o["byYear"].get(p["year"], 0) + 1
+                o["co"].update(b for j, b in enumerate(ids) if j != i)
+                if size == 1:
+                    o["solo"] += 1
+                else:
+                    o["first"] += i == 0
+                    o["last"] += i == size - 1
+                    o["multi"] += 1
+                    o["alpha"] += p["alpha"]
+        for o in rows.values():
+            ys = o["byYear"]
+            o["firstYear"], o["lastYear"] = min(ys), max(ys)
+            o["activeYears"] = len(ys)
+            o["span"] = o["lastYear"] - o["firstYear"] + 1
+            o["recent"] = sum(c for y, c in ys.items() if y > t - 5)
+            o["coauthorCount"] = len(o.pop("co"))
+            o["avgTeam"] = o.pop("teamSum") / o["pubs"]
+            o["alphaRate"] = o["alpha"] / o["multi"] if o["multi"] else 0
+        return rows
+
+    def overview(self, f, t, rows):
+        """index.html aggregateWindow() comm, with per-year author counts instead of sets and the
+        numbers the Overview / Network views otherwise take from the full author list."""
+        papers_by_year, author_years, first_seen, team_by_year, team_dist = {}, {}, {}, {}, {}
+        multi = alpha = 0
+        uf = UnionFind()
+        pairs = set()
+        recs = self.slice(f, t)
+        for p in recs:
+            ids, y = p["ids"], p["year"]
+            if len(ids) > 1:
+                multi += 1
+                alpha += p["alpha"]
+            papers_by_year[y] = papers_by_year.get(y, 0) + 1
+            team_by_year.setdefault(y, []).append(len(ids))
+            team_dist[len(ids)] = team_dist.get(len(ids), 0) + 1
+            author_years.setdefault(y, set()).update(ids)
+            for aid in ids:
+                if aid not in first_seen:
+                    first_seen[aid] = y
+            for i, a in enumerate(ids):
+                for b in ids[i + 1:]:
+                    if a != b:
+                        pairs.add((a, b) if a < b else (b, a))
+                        uf.union(a, b)
+        new_by_year = {}
+        for y in first_seen.values():
+            new_by_year[y] = new_by_year.get(y, 0) + 1
+        pubs = sorted(o["pubs"] for o in rows.values())
+        tot, cum, lorenz = sum(pubs), 0, [[0, 0]]
+        step = max(1, len(pubs) // LORENZ_POINTS)
+        for i, v in enumerate(pubs):
+            cum += v
+            if (i + 1) % step == 0 or i == len(pubs) - 1:
+                lorenz.append([(i + 1) / len(pubs), cum / tot])
+        if not pubs:
+            lorenz.append([1, 1])
+        top = sorted(rows.values(), key=lambda o: -o["coauthorCount"])[:25]
+        return {
+            "papersByYear": papers_by_year,
+            "authorYears": {y: len(s) for y, s in author_years.items()},
+            "newByYear": new_by_year, "teamByYear": team_by_year, "teamDist": team_dist,
+            "years": sorted(papers_by_year), "totalPapers": len(recs), "totalAuthors": len(rows),
+            "multi": multi, "alpha": alpha, "alphaRate": alpha / multi if multi else 0,
+            "gini": gini(pubs), "lorenz": lorenz, "pairs": len(pairs), "giant": uf.largest,
+            "recentAuthors": sum(1 for o in rows.values() if o["recent"] > 0),
+            "meanCoauthors": sum(o["coauthorCount"] for o in rows.values()) / len(rows) if rows else 0,
+            "topConnected": top,
+        }
+
+    def authors(self, f, t, rows, sort="pubs", direction=-1, min_pubs=1, q="", offset=0, limit=60):
+        qn = norm_text(q)
+        rel = {}
+        for aid, o in rows.items():
+            if o["pubs"] < min_pubs:
+                continue
+            if not qn:
+                rel[aid] = 0
+                continue
+            names = self.names.get(aid) or [norm_name(o["name"])]
+            if qn in names:
+                rel[aid] = 3
+            elif any(tok.startswith(qn) or (" " + qn) in (" " + n) for n in names for tok in n.split()):
+                rel[aid] = 2
+            elif any(qn in n for n in names):
+                rel[aid] = 1
+        hits = [rows[aid] for aid in rel]
+        if sort == "_rel":
+            hits.sort(key=lambda o: (-rel[o["id"]], -o["pubs"], o["name"]))
+        elif sort == "name":
+            hits.sort(key=lambda o: o["name"].lower(), reverse=direction < 0)
+        else:
+            hits.sort(key=lambda o: o.get(sort) or 0, reverse=direction < 0)
+        papers = self.titles(f, t, qn) if len(q.strip()) >= 3 else []
+        return {"total": len(hits), "rows": hits[offset:offset + limit], "papers": papers}
+
+    def titles(self, f, t, qn, limit=8):
+        """Newest papers in the window whose title has a word starting with every query word."""
+        words = qn.split()
+        out = []
+        for p in reversed(self.slice(f, t)):
+            toks = norm_text(p["title"]).split()
+            if all(any(tok.startswith(w) for tok in toks) for w in words):
+                out.append(self._paper(p))
+                if len(out) >= limit:
+                    break
+        return out
+
+    def _paper(self, p):
+        r = self.raw["records"][p["index"]]
+        return {"key": p["key"], "title": p["title"], "year": p["year"], "ee": r.get("url") or r.get("ee") or "",
+                "doi": r.get("doi") or "", "pages": r.get("pages") or "", "size": len(p["ids"]),
+                "authors": [{"id": i, "name": n} for i, n in zip(p["ids"], p["names"])]}
+
+    def author(self, aid, f, t, rows, k=14):
+        row = rows.get(aid)
+        d = self.detail.get(aid) or {}
+        papers, joint = [], {}
+        L = self.postings.get(aid) or []
+        lo, hi = bisect.bisect_left(L, bisect.bisect_left(self.years, f)), \
+            bisect.bisect_left(L, bisect.bisect_right(self.years, t))
+        for idx in L[lo:hi]:
+            p = self.papers[idx]
+            ids, size = p["ids"], len(p["ids"])
+            i = ids.index(aid)
+            pos = "solo" if size == 1 else "first" if i == 0 else "last" if i == size - 1 else "middle"
+            papers.append({**self._paper(p), "pos": pos})
+            for b in ids:
+                if b != aid:
+                    joint[b] = joint.get(b, 0) + 1
+        papers.sort(key=lambda x: -x["year"])
+        tops = sorted(joint.items(), key=lambda kv: -kv[1])[:k]
+        ids = [b for b, _ in tops]
+        links = []
+        for x, a in enumerate(ids):
+            co = (self.detail.get(a) or {}).get("coauthors") or {}
+            for y, b in enumerate(ids[x + 1:], x + 1):
+                if any(f <= int(yr) <= t for yr in co.get(b) or ()):
+                    links.append([x, y])
+        name = lambda b: rows[b]["name"] if b in rows else b
+        co = d.get("coauthors") or {}
+        return {"author": row, "papers": papers, "coauthors": co,
+                "names": {b: name(b) for b in co if b in rows},
+                "honors": d.get("honors") or {}, "links": d.get("links") or {},
+                "ego": {"nodes": [[b, name(b), n] for b, n in tops], "links": links}}
+
+    def header(self):
+        raw = self.raw
+        recs = raw.get("records") or []
+        no_pid = sum(1 for r in recs for a in r.get("authors") or []
+                     if not (a.get("id") if isinstance(a, dict) else "").startswith("pid:"))
+        return {"fetchedAt": self.fetched_at, "startYear": self.full_min, "endYear": self.full_max,
+                "source": raw.get("source"), "notes": raw.get("notes") or {}, "sample": bool(raw.get("sample")),
+                "authorMeta": self.meta, "records": [], "api": True,
+                "totalRecords": len(recs), "totalAuthors": len(self.postings),
+                "quality": {"noYear": sum(1 for r in recs if not r.get("year")), "noPid": no_pid}}